@@ -58,7 +58,12 @@ Version: v3.5.1
 """
 
 import re
-from typing import Any, Dict, Optional
+from typing import Any, Dict, Optional, Sequence
+
+
+def _compile_any(patterns: Sequence[str], flags: int = re.IGNORECASE) -> "re.Pattern[str]":
+    """Compile ``patterns`` into one alternation (matches iff any pattern does)."""
+    return re.compile("|".join(f"(?:{p})" for p in patterns), flags)
 
 
 class ConfidenceRouter:
@@ -80,47 +85,114 @@ class ConfidenceRouter:
 
     Attributes
     ----------
-    LOW_CONFIDENCE_PATTERNS : list[str]
+    LOW_CONFIDENCE_PATTERNS : tuple[str, ...]
         Regex patterns indicating uncertain responses
-    HIGH_CONFIDENCE_PATTERNS : list[str]
+    HIGH_CONFIDENCE_PATTERNS : tuple[str, ...]
         Regex patterns indicating confident responses
-    FORCE_QWEN_PATTERNS : list[str]
+    FORCE_QWEN_PATTERNS : tuple[str, ...]
         Patterns that ALWAYS require Qwen-3
-    VISUAL_TRIGGER_PATTERNS : list[str]
+    VISUAL_TRIGGER_PATTERNS : tuple[str, ...]
         Patterns indicating visual/multimodal input
+    VISION_PATTERNS_EXPLICIT : tuple[str, ...]
+        Explicit visual-analysis patterns for :meth:`should_use_vision`
+    CODE_EXPERT_PATTERNS : tuple[str, ...]
+        Code generation/debugging patterns for :meth:`should_use_code_expert`
     """
 
     # Patterns indicating low confidence in responses
-    LOW_CONFIDENCE_PATTERNS = [
+    LOW_CONFIDENCE_PATTERNS = (
         r"\b(?:no sé|no estoy seguro|no tengo certeza|quizás|tal vez|posiblemente)\b",
         r"\b(?:don't know|not sure|uncertain|maybe|perhaps|possibly)\b",
         r"\b(?:creo que|supongo que|imagino que|me parece que)\b",
         r"\b(?:i think|i guess|i suppose|it seems)\b",
         r"^\?\?+$",  # Only question marks
         r"^(?:eh|um|hmm|uh)\b",  # Hesitations
-    ]
+    )
 
     # Patterns indicating high confidence
-    HIGH_CONFIDENCE_PATTERNS = [
+    HIGH_CONFIDENCE_PATTERNS = (
         r"^\d+$",  # Exact numerical answer
         r"^(?:sí|no|yes|no)\b",  # Clear binary response
         r"\b(?:definitivamente|seguro|ciertamente|claramente)\b",
         r"\b(?:definitely|certainly|clearly|obviously)\b",
-    ]
+    )
 
     # Queries that ALWAYS require Qwen-3 (independent of LFM2)
-    FORCE_QWEN_PATTERNS = [
+    FORCE_QWEN_PATTERNS = (
         r"\b(?:analiza en profundidad|análisis detallado|explica paso a paso)\b",
         r"\b(?:deep analysis|detailed explanation|step by step)\b",
         r"```[\w]*\n",  # Long code (>3 lines)
         r"\b(?:compara exhaustivamente|evalúa críticamente)\b",
-    ]
+    )
 
     # Patterns indicating visual/multimodal input (activate Qwen3-VL)
-    VISUAL_TRIGGER_PATTERNS = [
+    VISUAL_TRIGGER_PATTERNS = (
         r"\b(?:analiza este gráfico|describe esta foto|describe esta imagen|mira esta imagen|analiza este diagrama)\b",
         r"\b(?:imagen|foto|gráfico|diagrama|figura|gráfica)\b",
-    ]
+    )
+
+    # Explicit visual patterns used by should_use_vision (v3.5.1 extended)
+    VISION_PATTERNS_EXPLICIT = (
+        # Direct visual analysis
+        r"\b(?:analiza|describe|identifica|detecta|reconoce)\s+(?:la\s+)?(?:imagen|foto|fotografía|picture|image)\b",
+        r"\b(?:qué|que)\s+(?:hay|aparece|se ve|muestra)\s+en\s+(?:la\s+)?(?:imagen|foto|pantalla|captura)\b",
+        r"\ben\s+(?:la\s+)?(?:imagen|foto|gráfico|diagrama|figura)\b",
+
+        # OCR and visual text
+        r"\b(?:lee|extrae|transcribe)\s+(?:el\s+)?texto\s+de\b",
+        r"\b(?:OCR|optical character recognition)\b",
+
+        # Graphics and visualizations
+        r"\b(?:gráfico|diagrama|esquema|figura|plot|chart|graph)\b.*\b(?:muestra|indica|representa)\b",
+        r"\b(?:analiza|interpreta)\s+(?:el\s+)?(?:gráfico|diagrama|esquema)\b",
+
+        # Video (frames as images)
+        r"\b(?:video|vídeo|clip|grabación)\b.*\b(?:muestra|frame|fotograma)\b",
+        r"\ben\s+el\s+(?:video|vídeo)\b",
+
+        # Generic visual verbs with context
+        r"\b(?:ver|mirar|observar|visualizar)\s+(?:la\s+)?(?:imagen|foto|pantalla)\b",
+    )
+
+    # Isolated visual nouns (should_use_vision, criterion 3)
+    VISUAL_NOUNS = r"\b(?:imagen|foto|gráfico|diagrama|captura|screenshot|pantalla)\b"
+
+    # Explicit code patterns used by should_use_code_expert (v3.5.1)
+    CODE_EXPERT_PATTERNS = (
+        # Code generation
+        r"\b(?:genera|crea|escribe|implementa)\s+(?:una\s+)?(?:función|clase|método|script|programa|código)\b",
+        r"\b(?:código|code)\s+(?:en\s+)?(?:Python|JavaScript|TypeScript|Rust|Go|C\+\+|Java)\b",
+
+        # Debugging and fixing
+        r"\b(?:corrige|arregla|debuggea|debug|fix)\s+(?:este\s+)?(?:código|error|bug)\b",
+        r"\b(?:error|exception|traceback|stack trace)\s+en\b",
+        r"\beste\s+código\s+(?:da|lanza|produce)\s+error\b",
+
+        # Refactoring and optimization
+        r"\b(?:optimiza|refactoriza|mejora)\s+(?:este\s+)?código\b",
+        r"\b(?:code review|revisión de código)\b",
+
+        # Tests and validation
+        r"\b(?:genera|crea)\s+(?:tests|pruebas unitarias|unit tests)\b",
+        r"\b(?:pytest|unittest|jest|mocha)\b",
+
+        # Complex patterns
+        r"```[\w]+\n",  # Code block (markdown)
+        r"\bdef\s+\w+\s*\(.*\):",  # Python function
+        r"\bfunction\s+\w+\s*\(.*\)\s*\{",  # JavaScript function
+    )
+
+    # Compiled once at class creation instead of on every routing call.
+    # Categories that only need a yes/no answer are merged into a single
+    # alternation so each one costs one regex scan instead of one per pattern.
+    _LOW_CONFIDENCE_RE = _compile_any(LOW_CONFIDENCE_PATTERNS)
+    _HIGH_CONFIDENCE_RE = _compile_any(HIGH_CONFIDENCE_PATTERNS)
+    _FORCE_QWEN_RE = _compile_any(FORCE_QWEN_PATTERNS)
+    _FORCE_QWEN_RES = tuple((p, re.compile(p, re.IGNORECASE)) for p in FORCE_QWEN_PATTERNS)
+    _VISUAL_TRIGGER_RE = _compile_any(VISUAL_TRIGGER_PATTERNS)
+    _VISION_EXPLICIT_RE = _compile_any(VISION_PATTERNS_EXPLICIT)
+    _VISUAL_NOUNS_RE = re.compile(VISUAL_NOUNS)
+    _CODE_EXPERT_RE = _compile_any(CODE_EXPERT_PATTERNS)
 
     def __init__(self):
         """Initialize router"""
@@ -187,10 +259,8 @@ class ConfidenceRouter:
         visual_flag = has_image or (input_type and "image" in input_type.lower())
 
         # Also check visual trigger patterns in prompt
-        for vpat in self.VISUAL_TRIGGER_PATTERNS:
-            if re.search(vpat, prompt_lower, re.IGNORECASE):
-                visual_flag = True
-                break
+        if self._VISUAL_TRIGGER_RE.search(prompt_lower):
+            visual_flag = True
 
         if visual_flag:
             # If it's a design-to-code request (image + programming), route to viscoder2
@@ -210,14 +280,17 @@ class ConfidenceRouter:
 
         # STEP 1: Force patterns (independent of response)
         # Very complex queries go directly to Qwen-3
-        for pattern in self.FORCE_QWEN_PATTERNS:
-            if re.search(pattern, prompt.lower(), re.IGNORECASE):
-                return {
-                    "target_model": "qwen3",
-                    "reason": "force_pattern_match",
-                    "confidence_score": 0.0,
-                    "pattern": pattern
-                }
+        # The merged regex rejects most prompts in one scan; on a hit the
+        # per-pattern loop reports the first matching pattern, as before.
+        if self._FORCE_QWEN_RE.search(prompt_lower):
+            for pattern, regex in self._FORCE_QWEN_RES:
+                if regex.search(prompt_lower):
+                    return {
+                        "target_model": "qwen3",
+                        "reason": "force_pattern_match",
+                        "confidence_score": 0.0,
+                        "pattern": pattern
+                    }
 
         # STEP 2: Analyze LFM2 response confidence
         confidence_score = self._calculate_confidence(
@@ -334,19 +407,12 @@ class ConfidenceRouter:
         response_lower = response.lower().strip()
 
         # Factor 1: Low confidence patterns
-        low_conf_matches = 0
-        for pattern in self.LOW_CONFIDENCE_PATTERNS:
-            if re.search(pattern, response_lower, re.IGNORECASE):
-                low_conf_matches += 1
-
-        if low_conf_matches > 0:
+        if self._LOW_CONFIDENCE_RE.search(response_lower):
             score -= 0.4  # Increased from 0.3 to be more aggressive
 
         # Factor 2: High confidence patterns
-        for pattern in self.HIGH_CONFIDENCE_PATTERNS:
-            if re.search(pattern, response_lower, re.IGNORECASE):
-                score += 0.3  # Increased from 0.2 to counteract length penalty
-                break
+        if self._HIGH_CONFIDENCE_RE.search(response_lower):
+            score += 0.3  # Increased from 0.2 to counteract length penalty
 
         # Factor 3: Length ratio (very short response = suspicious ONLY if long prompt)
         response_length = len(response)
@@ -405,36 +471,12 @@ class ConfidenceRouter:
         prompt_lower = prompt.lower()
 
         # Criterion 2: Explicit visual patterns (v3.5.1 extended)
-        VISION_PATTERNS_EXPLICIT = [
-            # Direct visual analysis
-            r"\b(?:analiza|describe|identifica|detecta|reconoce)\s+(?:la\s+)?(?:imagen|foto|fotografía|picture|image)\b",
-            r"\b(?:qué|que)\s+(?:hay|aparece|se ve|muestra)\s+en\s+(?:la\s+)?(?:imagen|foto|pantalla|captura)\b",
-            r"\ben\s+(?:la\s+)?(?:imagen|foto|gráfico|diagrama|figura)\b",
-
-            # OCR and visual text
-            r"\b(?:lee|extrae|transcribe)\s+(?:el\s+)?texto\s+de\b",
-            r"\b(?:OCR|optical character recognition)\b",
-
-            # Graphics and visualizations
-            r"\b(?:gráfico|diagrama|esquema|figura|plot|chart|graph)\b.*\b(?:muestra|indica|representa)\b",
-            r"\b(?:analiza|interpreta)\s+(?:el\s+)?(?:gráfico|diagrama|esquema)\b",
-
-            # Video (frames as images)
-            r"\b(?:video|vídeo|clip|grabación)\b.*\b(?:muestra|frame|fotograma)\b",
-            r"\ben\s+el\s+(?:video|vídeo)\b",
-
-            # Generic visual verbs with context
-            r"\b(?:ver|mirar|observar|visualizar)\s+(?:la\s+)?(?:imagen|foto|pantalla)\b",
-        ]
-
-        for pattern in VISION_PATTERNS_EXPLICIT:
-            if re.search(pattern, prompt_lower, re.IGNORECASE):
-                return True
+        if self._VISION_EXPLICIT_RE.search(prompt_lower):
+            return True
 
         # Criterion 3: Isolated visual nouns (lower confidence)
         # Only if they appear multiple times or in clear context
-        VISUAL_NOUNS = r"\b(?:imagen|foto|gráfico|diagrama|captura|screenshot|pantalla)\b"
-        visual_noun_matches = len(re.findall(VISUAL_NOUNS, prompt_lower))
+        visual_noun_matches = len(self._VISUAL_NOUNS_RE.findall(prompt_lower))
 
         if visual_noun_matches >= 2:
             # Multiple mentions → probably visual
@@ -487,33 +529,8 @@ class ConfidenceRouter:
         prompt_lower = prompt.lower()
 
         # Criterion 2: Explicit code patterns (v3.5.1)
-        CODE_EXPERT_PATTERNS = [
-            # Code generation
-            r"\b(?:genera|crea|escribe|implementa)\s+(?:una\s+)?(?:función|clase|método|script|programa|código)\b",
-            r"\b(?:código|code)\s+(?:en\s+)?(?:Python|JavaScript|TypeScript|Rust|Go|C\+\+|Java)\b",
-
-            # Debugging and fixing
-            r"\b(?:corrige|arregla|debuggea|debug|fix)\s+(?:este\s+)?(?:código|error|bug)\b",
-            r"\b(?:error|exception|traceback|stack trace)\s+en\b",
-            r"\beste\s+código\s+(?:da|lanza|produce)\s+error\b",
-
-            # Refactoring and optimization
-            r"\b(?:optimiza|refactoriza|mejora)\s+(?:este\s+)?código\b",
-            r"\b(?:code review|revisión de código)\b",
-
-            # Tests and validation
-            r"\b(?:genera|crea)\s+(?:tests|pruebas unitarias|unit tests)\b",
-            r"\b(?:pytest|unittest|jest|mocha)\b",
-
-            # Complex patterns
-            r"```[\w]+\n",  # Code block (markdown)
-            r"\bdef\s+\w+\s*\(.*\):",  # Python function
-            r"\bfunction\s+\w+\s*\(.*\)\s*\{",  # JavaScript function
-        ]
-
-        for pattern in CODE_EXPERT_PATTERNS:
-            if re.search(pattern, prompt_lower, re.IGNORECASE):
-                return True
+        if self._CODE_EXPERT_RE.search(prompt_lower):
+            return True
 
         # Default: Not a code query
         return False
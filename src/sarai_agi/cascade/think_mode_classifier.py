@@ -48,16 +48,16 @@ class ThinkModeClassifier:
 
     Attributes
     ----------
-    COMPLEX_PATTERNS : list[str]
+    COMPLEX_PATTERNS : tuple[str, ...]
         Patterns that ALWAYS require reasoning
-    SIMPLE_PATTERNS : list[str]
+    SIMPLE_PATTERNS : tuple[str, ...]
         Patterns that NEVER require reasoning
     model_pool : ModelPool, optional
         Instance of ModelPool to load LFM2
     """
 
     # Patterns that ALWAYS require reasoning
-    COMPLEX_PATTERNS = [
+    COMPLEX_PATTERNS = (
         # Mathematics
         r"\b(?:calcula|resuelve|ecuación|integral|derivada|probabilidad)\b",
         r"\d+\s*[+\-*/^]\s*\d+",  # Numerical operations
@@ -77,15 +77,28 @@ class ThinkModeClassifier:
         # Complex problems
         r"\b(?:diseña|arquitectura|escalabilidad|trade[-\s]?off)\b",
         r"\b(?:explica.*detalle|explain.*detail)\b",
-    ]
+    )
 
     # Patterns that NEVER require reasoning
-    SIMPLE_PATTERNS = [
+    SIMPLE_PATTERNS = (
         r"^¿?(?:hola|hi|hello|hey)\b",  # Greetings (with/without ¿)
         r"^¿?(?:qué tal|cómo estás|how are you)\b",
         r"^(?:gracias|thanks|thank you)\b",
         r"^(?:sí|no|ok|vale|sure)\b",  # Confirmations
-    ]
+    )
+
+    # Compiled once at class creation; classify() runs on every Qwen-3 call.
+    # All simple patterns are start-anchored, so the merged alternation lets
+    # the engine share their prefixes (e.g. "¿?") in a single match attempt.
+    _SIMPLE_RE = re.compile("|".join(f"(?:{p})" for p in SIMPLE_PATTERNS), re.IGNORECASE)
+    # Literal starts of every SIMPLE_PATTERNS alternative (keep in sync).
+    # A C-level startswith() rejects most prompts before touching the regex.
+    _SIMPLE_PREFIXES = (
+        "¿", "hola", "hi", "hello", "hey", "qué tal", "cómo estás", "how are you",
+        "gracias", "thanks", "thank you", "sí", "no", "ok", "vale", "sure",
+    )
+    # Only "does any complex pattern match?" matters: one merged alternation
+    _COMPLEX_RE = re.compile("|".join(f"(?:{p})" for p in COMPLEX_PATTERNS), re.IGNORECASE)
 
     def __init__(self, model_pool=None):
         """
@@ -125,14 +138,15 @@ class ThinkModeClassifier:
         prompt_lower = prompt.lower().strip()
 
         # 1.1 Simple patterns (high confidence)
-        for pattern in self.SIMPLE_PATTERNS:
-            if re.search(pattern, prompt_lower, re.IGNORECASE):
-                return "no_think"
+        if (
+            prompt_lower.startswith(self._SIMPLE_PREFIXES)
+            and self._SIMPLE_RE.search(prompt_lower)
+        ):
+            return "no_think"
 
         # 1.2 Complex patterns (high confidence)
-        for pattern in self.COMPLEX_PATTERNS:
-            if re.search(pattern, prompt_lower, re.IGNORECASE):
-                return "think"
+        if self._COMPLEX_RE.search(prompt_lower):
+            return "think"
 
         # STEP 2: Classification with LFM2 (ambiguous cases, <500ms)
         if self.model_pool:
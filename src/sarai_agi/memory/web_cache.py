@@ -25,6 +25,7 @@ Uso:
 import hashlib
 import logging
 import os
+import re
 import time
 from datetime import datetime
 from typing import Dict, Optional
@@ -51,6 +52,21 @@ except ImportError:
 
 logger = logging.getLogger(__name__)
 
+# Keywords de queries que requieren datos recientes (TTL reducido).
+# Una sola alternación compilada con límite de palabra inicial: evita falsos
+# positivos por subcadena ("know" ⊃ "now", "snowboard" ⊃ "now") y sigue
+# aceptando plurales ("precios", "resultados").
+_TIME_KEYWORDS = (
+    "clima", "weather", "precio", "price", "stock",
+    "noticias", "news", "hoy", "today", "ahora", "now",
+    "partido", "match", "resultado", "score", "live",
+    "temperatura", "temperature", "forecast", "pronóstico",
+)
+_TIME_SENSITIVE_RE = re.compile(
+    r"\b(?:" + "|".join(map(re.escape, _TIME_KEYWORDS)) + ")",
+    re.IGNORECASE,
+)
+
 
 class WebCache:
     """
@@ -116,14 +132,7 @@ class WebCache:
         Returns:
             True si la query es time-sensitive (TTL 5min)
         """
-        time_keywords = [
-            "clima", "weather", "precio", "price", "stock",
-            "noticias", "news", "hoy", "today", "ahora", "now",
-            "partido", "match", "resultado", "score", "live",
-            "temperatura", "temperature", "forecast", "pronóstico"
-        ]
-        query_lower = query.lower()
-        return any(kw in query_lower for kw in time_keywords)
+        return _TIME_SENSITIVE_RE.search(query) is not None
 
     def get(self, query: str) -> Optional[Dict]:
         """
@@ -53,6 +53,7 @@ from .quantization_selector import (
 )
 from .wrapper import (
     CascadeWrapper,
+    DynamicBatchManager,
     EmbeddingModelWrapper,
     GGUFModelWrapper,
     ModelRegistry,
@@ -94,6 +95,7 @@ __all__ = [
     "EmbeddingModelWrapper",
     "ModelRegistry",
     "CascadeWrapper",
+    "DynamicBatchManager",
     "get_model",
     "get_cascade_wrapper",
     "list_available_models",
@@ -105,16 +105,35 @@ Version
 3.5.1 (November 4, 2025)
 """
 
+import asyncio
+import copy
 import gc
+import hashlib
+import json
 import logging
 import os
+import queue
 import re
+import threading
 import time
 from abc import abstractmethod
-from typing import TYPE_CHECKING, Any, Dict, Iterator, List, Optional, Union
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import TYPE_CHECKING, Any, Callable, Dict, Iterator, List, Optional, Tuple, Union
 
 import yaml
 
+# Module (not names) so router/classifier factories stay patchable in tests
+from .. import cascade as _cascade
+
+# libyaml-backed parser when available (several times faster than pure Python)
+_YAML_LOADER = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+
+try:
+    import psutil
+except ImportError:
+    psutil = None  # Graceful degradation in tests
+
 if TYPE_CHECKING:
     import numpy as np
 else:
@@ -142,6 +161,99 @@ OutputType = Union[str, Dict[str, Any]]
 
 logger = logging.getLogger(__name__)
 
+# ${VAR} references in config values
+_ENV_VAR_RE = re.compile(r"\$\{([^}]+)\}")
+
+
+def _resolve_env(value: Optional[str], *, default: Optional[str] = None, label: str = "value") -> str:
+    """
+    Resolve ``${VAR}`` references using environment variables.
+
+    Unset variables are left as-is; if anything remains unresolved and a
+    ``default`` is given, the default is returned instead.
+    """
+    if not value:
+        return default if default is not None else ""
+
+    def replace(match: re.Match) -> str:
+        env_var = match.group(1)
+        env_value = os.getenv(env_var)
+        if env_value is None:
+            logger.warning(
+                "Environment variable %s referenced in %s but not set",
+                env_var,
+                label,
+            )
+            return match.group(0)
+        return env_value
+
+    resolved = _ENV_VAR_RE.sub(replace, value)
+
+    if "${" in resolved and default is not None:
+        # Use default if still unresolved
+        logger.warning(
+            "Environment variable unresolved in %s: %s. Using default %s",
+            label,
+            resolved,
+            default,
+        )
+        return default
+    return resolved
+
+
+def _prompt_key(prompt: str) -> str:
+    """Compact content hash used to key per-prompt caches."""
+    return hashlib.blake2b(prompt.encode("utf-8", "surrogatepass"), digest_size=16).hexdigest()
+
+
+# Think-mode decisions by prompt hash: retries and cascade fallbacks re-send the
+# same prompt, and the classifier may call LFM2 for ambiguous ones
+_THINK_DECISIONS: "OrderedDict[str, str]" = OrderedDict()
+_THINK_DECISIONS_MAX = 1024
+_THINK_DECISIONS_LOCK = threading.Lock()
+
+
+def _classify_think_mode(prompt: str, classifier: Any) -> str:
+    """Return the classifier's "think"/"no_think" decision, memoized per prompt."""
+    key = _prompt_key(prompt)
+    with _THINK_DECISIONS_LOCK:
+        decision = _THINK_DECISIONS.get(key)
+        if decision is not None:
+            _THINK_DECISIONS.move_to_end(key)
+            return decision
+
+    decision = classifier.classify(prompt)
+
+    with _THINK_DECISIONS_LOCK:
+        _THINK_DECISIONS[key] = decision
+        while len(_THINK_DECISIONS) > _THINK_DECISIONS_MAX:
+            _THINK_DECISIONS.popitem(last=False)
+    return decision
+
+
+# Shared keep-alive session for Ollama health probes (/api/tags), so many
+# wrappers cold-starting against the same server reuse one connection pool
+_OLLAMA_PROBE: Any = None
+_OLLAMA_PROBE_LOCK = threading.Lock()
+
+
+def _ollama_probe_session() -> Any:
+    """Return the process-wide Ollama probe session (created on first use)."""
+    global _OLLAMA_PROBE
+    if _OLLAMA_PROBE is None:
+        with _OLLAMA_PROBE_LOCK:
+            if _OLLAMA_PROBE is None:
+                import requests
+
+                session = requests.Session()
+                adapter = requests.adapters.HTTPAdapter(
+                    pool_connections=10, pool_maxsize=10, max_retries=0
+                )
+                session.mount("http://", adapter)
+                session.mount("https://", adapter)
+                _OLLAMA_PROBE = session
+    return _OLLAMA_PROBE
+
 
 # ============================================================================
 # BASE CLASS - Unified Model Wrapper
@@ -196,6 +308,7 @@ class UnifiedModelWrapper(Runnable):
         self.model = None
         self.is_loaded = False
         self.last_access = 0.0
+        self._load_lock = threading.Lock()
 
         logger.info(f"Initialized wrapper for {name} (backend: {self.backend})")
 
@@ -233,6 +346,25 @@ class UnifiedModelWrapper(Runnable):
             logger.error(f"Error invoking {self.name}: {e}")
             raise RuntimeError(f"Model invocation failed for {self.name}") from e
 
+    def invoke_batch(self, inputs: List[InputType],
+                     config: Optional[Dict] = None) -> List[OutputType]:
+        """
+        Execute several inputs as one model call.
+
+        Backends with batched generation (Transformers) run a single padded
+        forward pass; others fall back to sequential ``invoke``, which is
+        also the safe choice for engines that are not thread-safe
+        (llama.cpp). Results keep the order of ``inputs``.
+        """
+        self._ensure_loaded()
+        self.last_access = time.time()
+
+        try:
+            return self._invoke_batch_sync(inputs, config)
+        except Exception as e:
+            logger.error(f"Error invoking {self.name} (batch of {len(inputs)}): {e}")
+            raise RuntimeError(f"Model invocation failed for {self.name}") from e
+
     async def ainvoke(self, input: InputType, config: Optional[Dict] = None) -> OutputType:  # type: ignore[override]
         """
         Execute model asynchronously (LangChain interface).
@@ -240,10 +372,24 @@ class UnifiedModelWrapper(Runnable):
         By default calls invoke() in thread pool.
         Specific backends can override for native async.
         """
-        import asyncio
-        loop = asyncio.get_event_loop()
+        loop = asyncio.get_running_loop()
         return await loop.run_in_executor(None, self.invoke, input, config)
 
+    async def ainvoke_many(self, inputs: List[InputType],
+                           config: Optional[Dict] = None) -> List[OutputType]:
+        """
+        Execute several inputs concurrently.
+
+        All requests are in flight at once (``asyncio.gather``), so network
+        round-trips and server compute overlap instead of adding up.
+        Results keep the order of ``inputs``.
+
+        Example
+        -------
+        >>> responses = asyncio.run(wrapper.ainvoke_many(["q1", "q2", "q3"]))
+        """
+        return list(await asyncio.gather(*(self.ainvoke(item, config) for item in inputs)))
+
     def stream(self, input: InputType, config: Optional[Dict] = None) -> Iterator[str]:  # type: ignore[override]
         """
         Stream tokens (if backend supports it).
@@ -259,12 +405,21 @@ class UnifiedModelWrapper(Runnable):
     # ------------------------------------------------------------------------
 
     def _ensure_loaded(self) -> None:
-        """Load model if not in memory."""
-        if not self.is_loaded:
-            logger.info(f"Loading model {self.name}...")
-            self.model = self._load_model()
-            self.is_loaded = True
-            logger.info(f"Model {self.name} loaded successfully")
+        """
+        Load model if not in memory.
+
+        Thread-safe: concurrent first calls coalesce into a single
+        ``_load_model`` (double-checked locking), the rest wait for it.
+        """
+        if self.is_loaded:
+            return
+
+        with self._load_lock:
+            if not self.is_loaded:
+                logger.info(f"Loading model {self.name}...")
+                self.model = self._load_model()
+                self.is_loaded = True
+                logger.info(f"Model {self.name} loaded successfully")
 
     def unload(self) -> None:
         """
@@ -272,13 +427,14 @@ class UnifiedModelWrapper(Runnable):
 
         Useful for manual RAM management.
         """
-        if self.is_loaded:
-            logger.info(f"Unloading model {self.name}...")
-            del self.model
-            self.model = None
-            self.is_loaded = False
-            gc.collect()
-            logger.info(f"Model {self.name} unloaded")
+        with self._load_lock:
+            if self.is_loaded:
+                logger.info(f"Unloading model {self.name}...")
+                del self.model
+                self.model = None
+                self.is_loaded = False
+                gc.collect()
+                logger.info(f"Model {self.name} unloaded")
 
     # ------------------------------------------------------------------------
     # Abstract Methods (implemented by backends)
@@ -296,6 +452,11 @@ class UnifiedModelWrapper(Runnable):
         """
         pass
 
+    def _invoke_batch_sync(self, inputs: List[InputType],
+                           config: Optional[Dict] = None) -> List[OutputType]:
+        """Backend batch hook (default: one ``_invoke_sync`` per input)."""
+        return [self._invoke_sync(item, config) for item in inputs]
+
     @abstractmethod
     def _invoke_sync(self, input: InputType, config: Optional[Dict] = None) -> OutputType:
         """
@@ -341,8 +502,18 @@ class GGUFModelWrapper(UnifiedModelWrapper):
         Use memory mapping (default: True)
     - use_mlock : bool, optional
         Lock model in RAM (default: False, can cause OOM)
+
+    Concurrency
+    -----------
+    A ``Llama`` instance holds a single context and must not be used from
+    several threads at once, so generations on one wrapper are serialized
+    (``batch`` workers and concurrent ``ainvoke`` calls queue on the lock).
     """
 
+    def __init__(self, name: str, config: Dict[str, Any]):
+        super().__init__(name, config)
+        self._llama_lock = threading.Lock()
+
     def _load_model(self) -> Any:
         """Load GGUF model with llama-cpp-python."""
         try:
@@ -398,13 +569,14 @@ class GGUFModelWrapper(UnifiedModelWrapper):
         # Generate
         if self.model is None:
             raise RuntimeError("Model not loaded")
-        response = self.model(
-            prompt,
-            max_tokens=max_tokens,
-            temperature=temperature,
-            stop=["</s>", "Human:", "User:"],  # Common stop sequences
-            echo=False
-        )
+        with self._llama_lock:
+            response = self.model(
+                prompt,
+                max_tokens=max_tokens,
+                temperature=temperature,
+                stop=["</s>", "Human:", "User:"],  # Common stop sequences
+                echo=False
+            )
 
         return str(response["choices"][0]["text"]).strip()  # type: ignore[no-any-return]
 
@@ -430,6 +602,10 @@ class TransformersModelWrapper(UnifiedModelWrapper):
         Device mapping (default: "auto")
     """
 
+    # Serializes the temporary ``padding_side`` switch in _invoke_batch_sync
+    # so concurrent batches never restore each other's value mid-tokenize.
+    _PADDING_LOCK = threading.Lock()
+
     def _load_model(self) -> Any:
         """Load model with Transformers + 4-bit quantization."""
         try:
@@ -502,6 +678,59 @@ class TransformersModelWrapper(UnifiedModelWrapper):
 
         return str(response)  # type: ignore[no-any-return]
 
+    def _invoke_batch_sync(self, inputs: List[InputType],
+                           config: Optional[Dict] = None) -> List[str]:
+        """
+        Generate for several prompts in one forward pass.
+
+        Prompts are left-padded into a single ``[batch, seq_len]`` tensor
+        (decoder-only models continue from the right edge), and only the
+        generated tokens are decoded.
+        """
+        if len(inputs) <= 1:
+            return [self._invoke_sync(item, config) for item in inputs]
+
+        prompts = [
+            item.get("text", str(item)) if isinstance(item, dict) else str(item)
+            for item in inputs
+        ]
+
+        if self.model is None:
+            raise RuntimeError("Model not loaded")
+
+        tokenizer = self.tokenizer
+        if tokenizer.pad_token_id is None:
+            tokenizer.pad_token = tokenizer.eos_token
+
+        # Left padding only for this call (transformers>=4.40 has no per-call
+        # padding_side argument); the shared tokenizer is restored afterwards.
+        with self._PADDING_LOCK:
+            padding_side = tokenizer.padding_side
+            tokenizer.padding_side = "left"
+            try:
+                batch = tokenizer(prompts, return_tensors="pt", padding=True)
+            finally:
+                tokenizer.padding_side = padding_side
+        batch = {k: v.to(self.model.device) for k, v in batch.items()}
+
+        temperature = config.get("temperature") if config else None
+        temperature = temperature or self.config.get("temperature", 0.7)
+
+        max_tokens = config.get("max_tokens") if config else None
+        max_tokens = max_tokens or self.config.get("max_tokens", 512)
+
+        outputs = self.model.generate(
+            **batch,
+            max_new_tokens=max_tokens,
+            temperature=temperature,
+            do_sample=True,
+            pad_token_id=tokenizer.pad_token_id
+        )
+
+        input_len = batch["input_ids"].shape[-1]
+        responses = tokenizer.batch_decode(outputs[:, input_len:], skip_special_tokens=True)
+        return [str(response).strip() for response in responses]
+
 
 # ============================================================================
 # BACKEND 3: Multimodal Model Wrapper (Vision + Audio)
@@ -526,8 +755,28 @@ class MultimodalModelWrapper(UnifiedModelWrapper):
         Audio processing capability
     - supports_video : bool
         Video processing capability
+    - cache_image_embeds : bool, optional
+        Reuse vision-encoder outputs for repeated images (default: False).
+        Only honoured for architectures in ``IMAGE_EMBED_CACHE_MODEL_TYPES``,
+        whose image features and placeholder tokens the cached path mirrors
+    - image_cache_size : int, optional
+        Max cached vision-encoder outputs, keyed by image content and kept in
+        host memory (default: 256)
+    - image_cache_dir : str, optional
+        Directory for a persistent HDF5 tier of the image cache (requires h5py)
+    - image_max_pixels : int, optional
+        Downscale larger images while decoding (default: processor's max_pixels)
     """
 
+    # Bump when image preprocessing changes so persisted embeddings are invalidated
+    IMAGE_CACHE_VERSION = "v1"
+
+    # get_image_features returns plain (per-image) embeddings for these; e.g.
+    # Qwen3-VL also returns deepstack features, which the cached path can't feed
+    IMAGE_EMBED_CACHE_MODEL_TYPES = frozenset({"qwen2_vl", "qwen2_5_vl"})
+
+    _TEXT_INPUTS_CACHE_SIZE = 256
+
     def _load_model(self) -> Any:
         """Load multimodal model."""
         try:
@@ -543,7 +792,9 @@ class MultimodalModelWrapper(UnifiedModelWrapper):
         logger.info(f"Loading Multimodal model: {repo_id}")
 
         # Load processor (tokenizer + image processor)
-        self.processor = AutoProcessor.from_pretrained(repo_id)
+        # use_fast=True selects the tensor-backed image processor, which fuses
+        # rescale + normalize + channel transpose into a single pass
+        self.processor = AutoProcessor.from_pretrained(repo_id, use_fast=True)
 
         # Load model
         model = AutoModelForCausalLM.from_pretrained(
@@ -552,8 +803,64 @@ class MultimodalModelWrapper(UnifiedModelWrapper):
             trust_remote_code=True
         )
 
+        # LRU cache of vision-encoder outputs (image content hash → CPU
+        # embeddings); moved to the device on each hit so it holds no VRAM
+        self._cache_image_embeds = self._supports_image_embed_cache(model)
+        self._img_embed_cache: OrderedDict = OrderedDict()
+        self._img_embed_cache_size = self.config.get("image_cache_size", 256)
+        self._img_embed_lock = threading.Lock()
+        self._img_embed_store = self._open_embed_store() if self._cache_image_embeds else None
+        self._img_embed_store_pending = 0
+
+        # CPU processor outputs for text-only prompts (hash → inputs); moved to
+        # the device on each use so the cache holds no VRAM
+        self._text_inputs_cache: OrderedDict = OrderedDict()
+        self._text_inputs_lock = threading.Lock()
+
         return model
 
+    def _supports_image_embed_cache(self, model: Any) -> bool:
+        """Whether ``cache_image_embeds`` is set and the architecture supports it."""
+        if not self.config.get("cache_image_embeds", False):
+            return False
+
+        model_type = getattr(getattr(model, "config", None), "model_type", None)
+        if model_type in self.IMAGE_EMBED_CACHE_MODEL_TYPES and hasattr(
+            model, "get_image_features"
+        ):
+            return True
+
+        logger.warning(
+            f"cache_image_embeds ignored for {self.name}: "
+            f"unsupported architecture {model_type!r}"
+        )
+        return False
+
+    def _open_embed_store(self) -> Any:
+        """Open the on-disk HDF5 embedding store (None if disabled/unavailable)."""
+        cache_dir = self.config.get("image_cache_dir")
+        if not cache_dir:
+            return None
+
+        try:
+            import h5py
+        except ImportError:
+            logger.warning("h5py not installed, persistent image cache disabled")
+            return None
+
+        store_path = os.path.join(cache_dir, "vit_embeds.h5")
+        try:
+            os.makedirs(cache_dir, exist_ok=True)
+            store = h5py.File(store_path, "a", libver="latest")
+        except OSError as e:
+            # HDF5 locks the file: another process using the same
+            # image_cache_dir (or a stale lock) must not fail the model load
+            logger.warning(f"Persistent image cache unavailable ({store_path}): {e}")
+            return None
+
+        logger.info(f"Persistent image embedding cache: {store_path}")
+        return store
+
     def _invoke_sync(self, input: InputType, config: Optional[Dict] = None) -> str:
         """
         Generate multimodal response.
@@ -591,37 +898,249 @@ class MultimodalModelWrapper(UnifiedModelWrapper):
     def _process_with_image(self, text: str, image_path: Union[str, List[str]],
                            config: Optional[Dict] = None) -> str:
         """Process text + image(s)."""
-        from PIL import Image
-
-        # Load image(s)
-        if isinstance(image_path, list):
-            images = [Image.open(img) for img in image_path]
-        else:
-            images = [Image.open(image_path)]
+        images = self._load_images(image_path)
 
-        # Process with multimodal processor
+        # Process with multimodal processor (single batched call for all images)
         inputs = self.processor(
             text=text,
             images=images,
             return_tensors="pt"
         )
 
-        # Move to device
-        inputs = {k: v.to(self.model.device) for k, v in inputs.items()}
+        inputs = self._to_device(inputs)
 
         # Generate
         max_tokens = config.get("max_tokens", 512) if config else 512
 
-        outputs = self.model.generate(
-            **inputs,
-            max_new_tokens=max_tokens
+        if getattr(self, "_cache_image_embeds", False):
+            # Feed cached/merged embeddings so repeated images skip the ViT
+            outputs = self._generate_with_cached_images(inputs, images, max_tokens)
+        else:
+            outputs = self.model.generate(
+                **inputs,
+                max_new_tokens=max_tokens
+            )
+
+        return self._decode_new_tokens(outputs, inputs["input_ids"].shape[-1])
+
+    def _to_device(self, inputs: Any) -> Any:
+        """
+        Move processor outputs to the model device in one ``BatchFeature.to`` call.
+
+        On CUDA, pixel values (the bulk of the transfer) are pinned first so the
+        host→device copies are asynchronous; they are queued on the current
+        stream, so ``generate`` still sees the data before using it.
+        """
+        device = self.model.device
+        if getattr(device, "type", None) != "cuda":
+            return inputs.to(device)
+
+        for key in ("pixel_values", "pixel_values_videos"):
+            pixel_values = inputs.get(key)
+            if pixel_values is not None and not pixel_values.is_pinned():
+                inputs[key] = pixel_values.pin_memory()
+
+        return inputs.to(device, non_blocking=True)
+
+    def _text_inputs(self, text: str) -> Any:
+        """Tokenize a text-only prompt, reusing inputs for repeated prompts (LRU)."""
+        cache = getattr(self, "_text_inputs_cache", None)
+        if cache is None:
+            return self._to_device(self.processor(text=text, return_tensors="pt"))
+
+        key = _prompt_key(text)
+        with self._text_inputs_lock:
+            inputs = cache.get(key)
+            if inputs is not None:
+                cache.move_to_end(key)
+
+        if inputs is None:
+            inputs = self.processor(text=text, return_tensors="pt")
+            with self._text_inputs_lock:
+                cache[key] = inputs
+                while len(cache) > self._TEXT_INPUTS_CACHE_SIZE:
+                    cache.popitem(last=False)
+
+        # BatchFeature.to moves in place, so hand _to_device a shallow copy
+        return self._to_device(copy.copy(inputs))
+
+    def _decode_new_tokens(self, outputs: Any, input_len: int) -> str:
+        """Decode only the generated tokens (the prompt is sliced off by token index)."""
+        new_tokens = outputs[0][input_len:]
+        return str(self.processor.decode(new_tokens, skip_special_tokens=True).strip())
+
+    def _generate_with_cached_images(self, inputs: Dict[str, Any], images: List[Any],
+                                     max_tokens: int) -> Any:
+        """
+        Generate from merged text + image embeddings.
+
+        The vision tower output is looked up by image content hash; only on a
+        miss is ``get_image_features`` run. Image embeddings are scattered into
+        the image placeholder positions, mirroring the model's own forward.
+        """
+        input_ids = inputs["input_ids"]
+        image_embeds = self._get_image_embeds(inputs, images)
+
+        inputs_embeds = self.model.get_input_embeddings()(input_ids)
+        image_mask = (input_ids == self.model.config.image_token_id).unsqueeze(-1)
+        inputs_embeds = inputs_embeds.masked_scatter(
+            image_mask.expand_as(inputs_embeds),
+            image_embeds.to(inputs_embeds.device, inputs_embeds.dtype),
         )
 
-        # Decode
-        response = self.processor.decode(outputs[0], skip_special_tokens=True)
-        response = response[len(text):].strip()
+        generate_kwargs = {
+            k: v for k, v in inputs.items() if k not in ("pixel_values", "input_ids")
+        }
+        return self.model.generate(
+            input_ids=input_ids,
+            inputs_embeds=inputs_embeds,
+            max_new_tokens=max_tokens,
+            **generate_kwargs,
+        )
 
-        return response
+    def _get_image_embeds(self, inputs: Dict[str, Any], images: List[Any]) -> Any:
+        """
+        Return vision-encoder embeddings on the model device (LRU of CPU copies).
+
+        The memory LRU and the HDF5 store are only touched under
+        ``_img_embed_lock``; the vision tower itself runs outside it. When two
+        callers miss on the same images, both compute and the second write
+        finds the key already stored and skips it.
+        """
+        namespace = f"{self.config['repo_id']}:{self.IMAGE_CACHE_VERSION}"
+        key = self._image_cache_key(images, namespace)
+
+        stored = None
+        with self._img_embed_lock:
+            cached = self._img_embed_cache.get(key)
+            if cached is not None:
+                self._img_embed_cache.move_to_end(key)
+            else:
+                store = self._img_embed_store
+                if store is not None and key in store:
+                    stored = store[key][()]
+
+        if cached is not None:
+            logger.debug(f"Image embedding cache hit ({len(images)} images)")
+            return cached.to(self.model.device, non_blocking=True)
+
+        import torch
+
+        image_embeds = None
+        if stored is not None:
+            logger.debug(f"Image embedding disk cache hit ({len(images)} images)")
+            host_embeds = torch.from_numpy(stored)
+        else:
+            with torch.no_grad():
+                image_embeds = self.model.get_image_features(
+                    inputs["pixel_values"], inputs.get("image_grid_thw")
+                )
+            if isinstance(image_embeds, (list, tuple)):
+                image_embeds = torch.cat(list(image_embeds), dim=0)
+            host_embeds = image_embeds.cpu()
+
+        # Pinned host copies make the per-hit host→device copy asynchronous
+        if torch.cuda.is_available():
+            host_embeds = host_embeds.pin_memory()
+        if image_embeds is None:
+            image_embeds = host_embeds.to(self.model.device, non_blocking=True)
+
+        with self._img_embed_lock:
+            store = self._img_embed_store
+            if store is not None and stored is None and key not in store:
+                store.create_dataset(key, data=host_embeds.float().numpy())
+                self._img_embed_store_pending += 1
+                if self._img_embed_store_pending >= 32:
+                    store.flush()
+                    self._img_embed_store_pending = 0
+
+            self._img_embed_cache[key] = host_embeds
+            while len(self._img_embed_cache) > self._img_embed_cache_size:
+                self._img_embed_cache.popitem(last=False)
+
+        return image_embeds
+
+    @staticmethod
+    def _image_cache_key(images: List[Any], namespace: str = "") -> str:
+        """Content hash of decoded images (order-sensitive) within a namespace."""
+        digest = hashlib.blake2b(namespace.encode(), digest_size=16)
+        for img in images:
+            digest.update(f"{img.mode}:{img.size}".encode())
+            digest.update(img.tobytes())
+        return digest.hexdigest()
+
+    def _load_images(self, image_path: Union[str, List[str]]) -> List[Any]:
+        """
+        Decode image(s) to RGB.
+
+        Multiple images (e.g. video frames) are decoded concurrently: PIL
+        releases the GIL while decoding, so a thread pool overlaps the work.
+        Images above the processor's pixel budget are shrunk while decoding
+        (see ``_decode_and_resize``).
+        """
+        max_pixels = self._image_max_pixels()
+
+        def decode(path: str) -> Any:
+            return self._decode_and_resize(path, max_pixels)
+
+        paths = image_path if isinstance(image_path, list) else [image_path]
+
+        if len(paths) <= 1:
+            return [decode(path) for path in paths]
+
+        with ThreadPoolExecutor(max_workers=min(8, len(paths))) as executor:
+            return list(executor.map(decode, paths))
+
+    def _image_max_pixels(self) -> Optional[int]:
+        """Pixel budget images are resized to (config, else processor's max_pixels)."""
+        max_pixels = self.config.get("image_max_pixels")
+        if max_pixels is None:
+            image_processor = getattr(getattr(self, "processor", None), "image_processor", None)
+            max_pixels = getattr(image_processor, "max_pixels", None)
+        return max_pixels
+
+    @staticmethod
+    def _decode_and_resize(path: str, max_pixels: Optional[int] = None) -> Any:
+        """
+        Decode an image to RGB, downscaling it to ``max_pixels`` if larger.
+
+        For JPEG, ``Image.draft`` makes libjpeg(-turbo) decode directly at a
+        reduced scale (scaled IDCT), so large photos are never fully decoded.
+        The remaining downscale is a single bilinear resize with
+        ``reducing_gap``. The processor still does the final patch-aligned
+        resize, which is cheap on the smaller image.
+        """
+        from PIL import Image
+
+        img = Image.open(path)
+        if not max_pixels:
+            return img.convert("RGB")
+
+        width, height = img.size
+        if width * height <= max_pixels:
+            return img.convert("RGB")
+
+        scale = (max_pixels / (width * height)) ** 0.5
+        target = (max(1, int(width * scale)), max(1, int(height * scale)))
+
+        img.draft("RGB", target)
+        img = img.convert("RGB")
+        if img.size != target:
+            img = img.resize(target, Image.BILINEAR, reducing_gap=2.0)
+        return img
+
+    def unload(self) -> None:
+        """Unload model, drop cached image embeddings and close the disk store."""
+        if hasattr(self, "_img_embed_cache"):
+            with self._img_embed_lock:
+                self._img_embed_cache.clear()
+                if self._img_embed_store is not None:
+                    self._img_embed_store.close()
+                    self._img_embed_store = None
+        if hasattr(self, "_text_inputs_cache"):
+            with self._text_inputs_lock:
+                self._text_inputs_cache.clear()
+        super().unload()
 
     def _process_with_audio(self, text: str, audio_data: Union[bytes, str],
                            config: Optional[Dict] = None) -> str:
@@ -630,23 +1149,59 @@ class MultimodalModelWrapper(UnifiedModelWrapper):
         logger.warning("Audio processing not fully implemented yet")
         return self._process_text_only(text, config)
 
-    def _process_with_video(self, text: str, frames: List[str],
+    def _process_with_video(self, text: str, frames: Union[List[str], str, Any],
                            config: Optional[Dict] = None) -> str:
-        """Process text + video (frames)."""
-        # Video = sequence of images
-        return self._process_with_image(text, frames, config)
+        """
+        Process text + video.
+
+        ``frames`` may be a list of frame image paths (decoded as images), a
+        pre-decoded ``[T, C, H, W]`` uint8 tensor, or a path to a video file,
+        which is decoded in one pass by torchvision.
+        """
+        if isinstance(frames, list):
+            # Video = sequence of images
+            return self._process_with_image(text, frames, config)
+
+        video = self._load_video(frames)
+
+        inputs = self._to_device(self.processor(
+            text=text,
+            videos=[video],
+            return_tensors="pt"
+        ))
+
+        max_tokens = config.get("max_tokens", 512) if config else 512
+
+        outputs = self.model.generate(**inputs, max_new_tokens=max_tokens)
+
+        return self._decode_new_tokens(outputs, inputs["input_ids"].shape[-1])
+
+    @staticmethod
+    def _load_video(video: Union[str, Any]) -> Any:
+        """Return video frames as a ``[T, C, H, W]`` tensor (decoding a file path)."""
+        if not isinstance(video, (str, os.PathLike)):
+            return video
+
+        try:
+            from torchvision.io import read_video
+        except ImportError as e:
+            raise ImportError(
+                "torchvision not installed. "
+                "Install with: pip install torchvision"
+            ) from e
+
+        frames, _, _ = read_video(str(video), pts_unit="sec", output_format="TCHW")
+        return frames
 
     def _process_text_only(self, text: str, config: Optional[Dict] = None) -> str:
         """Fallback to simple text."""
-        inputs = self.processor(text=text, return_tensors="pt")
-        inputs = {k: v.to(self.model.device) for k, v in inputs.items()}
+        inputs = self._text_inputs(text)
 
         max_tokens = config.get("max_tokens", 512) if config else 512
 
         outputs = self.model.generate(**inputs, max_new_tokens=max_tokens)
-        response = self.processor.decode(outputs[0], skip_special_tokens=True)
 
-        return response[len(text):].strip()
+        return self._decode_new_tokens(outputs, inputs["input_ids"].shape[-1])
 
 
 # ============================================================================
@@ -668,6 +1223,12 @@ class OllamaModelWrapper(UnifiedModelWrapper):
         Model name in Ollama (e.g., "llama3:70b" or "${OLLAMA_MODEL_NAME}")
     - think_mode : str, optional
         For Qwen-3: "enabled", "disabled", or auto (uses ThinkModeClassifier)
+
+    Concurrency
+    -----------
+    ``ainvoke_many`` keeps several requests in flight. The server only
+    processes them in parallel when started with ``OLLAMA_NUM_PARALLEL>1``;
+    ``OLLAMA_MAX_LOADED_MODELS`` controls how many models stay resident.
     """
 
     def _load_model(self) -> None:
@@ -677,51 +1238,27 @@ class OllamaModelWrapper(UnifiedModelWrapper):
         """
         import requests
 
-        def resolve_env(value: Optional[str], *, default: Optional[str] = None, label: str = "value") -> str:
-            """Resolve ${VAR} using environment variables."""
-            if not value:
-                return default if default is not None else ""
-
-            pattern = re.compile(r"\$\{([^}]+)\}")
-
-            def replace(match: re.Match) -> str:
-                env_var = match.group(1)
-                env_value = os.getenv(env_var)
-                if env_value is None:
-                    logger.warning(
-                        "Environment variable %s referenced in %s but not set",
-                        env_var,
-                        label,
-                    )
-                    return match.group(0)
-                return env_value
-
-            resolved = pattern.sub(replace, value)
-
-            if "${" in resolved:
-                # Use default if still unresolved
-                if default is not None:
-                    logger.warning(
-                        "Environment variable unresolved in %s: %s. Using default %s",
-                        label,
-                        resolved,
-                        default,
-                    )
-                    return default
-            return resolved
-
         # Resolve API URL (never hardcode IPs)
         env_api_url = os.getenv("OLLAMA_BASE_URL") or os.getenv("OLLAMA_API_URL")
         raw_api_url = self.config.get("api_url") or env_api_url or "http://localhost:11434"
-        api_url = resolve_env(
+        api_url = _resolve_env(
             raw_api_url,
             default=env_api_url or "http://localhost:11434",
             label="api_url",
         )
         api_url = api_url.rstrip("/") if api_url else "http://localhost:11434"
 
+        # Pooled keep-alive session reused by every invoke (avoids a TCP
+        # handshake per request)
+        self._http = requests.Session()
+        adapter = requests.adapters.HTTPAdapter(
+            pool_connections=10, pool_maxsize=40, max_retries=0
+        )
+        self._http.mount("http://", adapter)
+        self._http.mount("https://", adapter)
+
         try:
-            response = requests.get(f"{api_url}/api/tags", timeout=5)
+            response = _ollama_probe_session().get(f"{api_url}/api/tags", timeout=5)
             response.raise_for_status()
             logger.info(f"Ollama server available at {api_url}")
         except Exception as e:
@@ -737,7 +1274,7 @@ class OllamaModelWrapper(UnifiedModelWrapper):
         # Resolve model_name with fallback to first available model
         raw_model_name = self.config.get("model_name")
         default_model = available_models[0] if available_models else ""
-        model_name = resolve_env(raw_model_name, default=default_model, label="model_name")
+        model_name = _resolve_env(raw_model_name, default=default_model, label="model_name")
 
         if not model_name:
             raise ValueError(
@@ -761,16 +1298,61 @@ class OllamaModelWrapper(UnifiedModelWrapper):
         return None  # No model object
 
     def _invoke_sync(self, input: InputType, config: Optional[Dict] = None) -> str:
+        """Generate text via Ollama API (collects the streamed chunks)."""
+        return "".join(self._invoke_stream(input, config))
+
+    def stream(self, input: InputType, config: Optional[Dict] = None) -> Iterator[str]:  # type: ignore[override]
+        """
+        Stream tokens as Ollama generates them.
+
+        Consumers can start processing after the first chunk instead of
+        waiting for the whole generation.
+        """
+        self._ensure_loaded()
+        self.last_access = time.time()
+
+        try:
+            yield from self._invoke_stream(input, config)
+        except Exception as e:
+            logger.error(f"Error streaming {self.name}: {e}")
+            raise RuntimeError(f"Model streaming failed for {self.name}") from e
+
+    def _invoke_stream(self, input: InputType, config: Optional[Dict] = None) -> Iterator[str]:
+        """POST /api/generate with stream=true and yield each "response" chunk."""
+        api_url, payload = self._build_payload(input, config)
+
+        response = self._http.post(
+            f"{api_url}/api/generate",
+            json=payload,
+            stream=True,
+            timeout=(10, 300)  # 10s connect, 5 min between chunks
+        )
+        try:
+            response.raise_for_status()
+
+            for line in response.iter_lines():
+                if not line:
+                    continue
+                chunk = json.loads(line)
+                if "error" in chunk:
+                    raise RuntimeError(f"Ollama error: {chunk['error']}")
+                if chunk.get("response"):
+                    yield chunk["response"]
+                if chunk.get("done"):
+                    break
+        finally:
+            response.close()
+
+    def _build_payload(self, input: InputType,
+                       config: Optional[Dict] = None) -> Tuple[str, Dict[str, Any]]:
         """
-        Generate text via Ollama API.
+        Build the /api/generate request (api_url, payload).
 
         Qwen-3 Think Mode (v3.3):
             - If think_mode config exists, uses ThinkModeClassifier to decide
             - Classifier uses LFM2-1.2B to analyze complexity in <500ms
             - Injects /think or /no_think based on result
         """
-        import requests
-
         # Convert input to string
         if isinstance(input, list):
             prompt = "\n".join([msg.content for msg in input if hasattr(msg, 'content')])
@@ -799,15 +1381,13 @@ class OllamaModelWrapper(UnifiedModelWrapper):
         think_mode_config = self.config.get("think_mode")
 
         if think_mode_config and "qwen-3" in model_name.lower():
-            # Import classifier only if needed
             try:
-                from sarai_agi.cascade import get_think_mode_classifier
-
                 # Get model_pool if available (to use LFM2)
                 model_pool = config.get("model_pool") if config else None
 
-                classifier = get_think_mode_classifier(model_pool)
-                decision = classifier.classify(prompt)
+                decision = _classify_think_mode(
+                    prompt, _cascade.get_think_mode_classifier(model_pool)
+                )
 
                 # Inject suffix based on classification
                 if decision == "think":
@@ -831,20 +1411,21 @@ class OllamaModelWrapper(UnifiedModelWrapper):
         payload = {
             "model": model_name,
             "prompt": prompt,
-            "stream": False,
+            "stream": True,
             "options": {
                 "temperature": temperature
             }
         }
 
-        response = requests.post(
-            f"{api_url}/api/generate",
-            json=payload,
-            timeout=300  # 5 min timeout
-        )
-        response.raise_for_status()
+        return api_url, payload
 
-        return response.json()["response"]
+    def unload(self) -> None:
+        """Close pooled HTTP connections and reset load state."""
+        http = getattr(self, "_http", None)
+        if http is not None:
+            http.close()
+            self._http = None
+        super().unload()
 
 
 # ============================================================================
@@ -875,15 +1456,14 @@ class OpenAIAPIWrapper(UnifiedModelWrapper):
         APIs don't require loading.
         Just validate API key.
         """
-        api_key = self.config.get("api_key")
+        raw_api_key = self.config.get("api_key")
 
-        # Resolve environment variable if ${VAR}
-        if api_key and api_key.startswith("${") and api_key.endswith("}"):
-            env_var = api_key[2:-1]
-            api_key = os.getenv(env_var)
+        # Resolve ${VAR} references
+        api_key = _resolve_env(raw_api_key, label="api_key") if raw_api_key else None
 
-            if not api_key:
-                raise ValueError(f"API key environment variable not set: {env_var}")
+        if api_key and "${" in api_key:
+            env_var = _ENV_VAR_RE.search(api_key).group(1)  # type: ignore[union-attr]
+            raise ValueError(f"API key environment variable not set: {env_var}")
 
         self.api_key = api_key
 
@@ -894,6 +1474,35 @@ class OpenAIAPIWrapper(UnifiedModelWrapper):
 
     def _invoke_sync(self, input: InputType, config: Optional[Dict] = None) -> str:
         """Generate text via OpenAI API."""
+        response = self._get_client().chat.completions.create(
+            **self._build_request(input, config)
+        )
+
+        return response.choices[0].message.content
+
+    async def ainvoke(self, input: InputType, config: Optional[Dict] = None) -> str:  # type: ignore[override]
+        """
+        Native async generation with ``openai.AsyncOpenAI``.
+
+        Unlike the base implementation, no worker thread is held per request,
+        so ``ainvoke_many`` can fan out to many concurrent calls.
+        """
+        self._ensure_loaded()
+        self.last_access = time.time()
+
+        try:
+            response = await self._get_async_client().chat.completions.create(
+                **self._build_request(input, config)
+            )
+        except Exception as e:
+            logger.error(f"Error invoking {self.name}: {e}")
+            raise RuntimeError(f"Model invocation failed for {self.name}") from e
+
+        return response.choices[0].message.content
+
+    @staticmethod
+    def _import_openai() -> Any:
+        """Import openai lazily (optional dependency)."""
         try:
             import openai
         except ImportError as e:
@@ -901,15 +1510,45 @@ class OpenAIAPIWrapper(UnifiedModelWrapper):
                 "openai not installed. "
                 "Install with: pip install openai"
             ) from e
+        return openai
 
-        # Configure client
-        api_url = self.config.get("api_url", "https://api.openai.com/v1")
-        model_name = self.config["model_name"]
+    def _get_client(self) -> Any:
+        """
+        Lazily create the sync client (reused across calls).
 
-        client = openai.OpenAI(
-            api_key=self.api_key,
-            base_url=api_url
-        )
+        The client owns a keep-alive connection pool, so reusing it avoids a
+        TCP + TLS handshake per request.
+        """
+        if getattr(self, "_client", None) is None:
+            openai = self._import_openai()
+            self._client = openai.OpenAI(
+                api_key=self.api_key,
+                base_url=self.config.get("api_url", "https://api.openai.com/v1")
+            )
+        return self._client
+
+    def _get_async_client(self) -> Any:
+        """Lazily create the async client (reused across calls)."""
+        if getattr(self, "_aclient", None) is None:
+            openai = self._import_openai()
+            self._aclient = openai.AsyncOpenAI(
+                api_key=self.api_key,
+                base_url=self.config.get("api_url", "https://api.openai.com/v1")
+            )
+        return self._aclient
+
+    def unload(self) -> None:
+        """Close pooled connections and reset clients."""
+        client = getattr(self, "_client", None)
+        if client is not None:
+            client.close()
+        self._client = None
+        self._aclient = None
+        super().unload()
+
+    def _build_request(self, input: InputType, config: Optional[Dict] = None) -> Dict[str, Any]:
+        """Build chat.completions.create() kwargs from input + runtime config."""
+        model_name = self.config["model_name"]
 
         # Convert input to messages
         if isinstance(input, list):
@@ -937,15 +1576,132 @@ class OpenAIAPIWrapper(UnifiedModelWrapper):
         temperature = config.get("temperature", 0.7) if config else 0.7
         max_tokens = config.get("max_tokens", 1024) if config else 1024
 
-        # Request
-        response = client.chat.completions.create(
-            model=model_name,
-            messages=messages,
-            temperature=temperature,
-            max_tokens=max_tokens
-        )
+        return {
+            "model": model_name,
+            "messages": messages,
+            "temperature": temperature,
+            "max_tokens": max_tokens,
+        }
 
-        return response.choices[0].message.content
+
+# ============================================================================
+# DYNAMIC MICRO-BATCHING
+# ============================================================================
+
+def _length_buckets(lengths: List[int], max_length: int,
+                    max_batch_size: int) -> List[Tuple[int, List[int]]]:
+    """
+    Group sequence indices by padded length.
+
+    Each length is rounded up to a power of two (min 32, capped at
+    ``max_length``); indices sharing a bucket are split into chunks of at
+    most ``max_batch_size``.
+
+    Returns
+    -------
+    List[Tuple[int, List[int]]]
+        ``(bucket_len, indices)`` pairs, shortest bucket first
+
+    Example
+    -------
+    >>> _length_buckets([5, 40, 7], max_length=512, max_batch_size=64)
+    [(32, [0, 2]), (64, [1])]
+    """
+    buckets: Dict[int, List[int]] = {}
+    for index, length in enumerate(lengths):
+        bucket_len = 32
+        while bucket_len < length:
+            bucket_len *= 2
+        buckets.setdefault(min(bucket_len, max_length), []).append(index)
+
+    return [
+        (bucket_len, indices[start:start + max_batch_size])
+        for bucket_len, indices in sorted(buckets.items())
+        for start in range(0, len(indices), max_batch_size)
+    ]
+
+
+class DynamicBatchManager:
+    """
+    Fuse concurrent single-item requests into one batched call.
+
+    A background worker takes the first queued item, then keeps collecting
+    items for up to ``max_batch_duration_secs`` (or until ``max_batch_size``)
+    and runs ``process_batch`` once for the whole group. Each caller gets
+    its own row of the result through a ``Future``.
+
+    Parameters
+    ----------
+    process_batch : callable
+        ``process_batch(items) -> results`` with ``len(results) == len(items)``
+    max_batch_size : int
+        Max items fused into one call (default: 64)
+    max_batch_duration_secs : float
+        Max time to wait for more items after the first (default: 5ms)
+
+    Example
+    -------
+    >>> batcher = DynamicBatchManager(encode_texts, max_batch_size=64)
+    >>> vector = batcher.submit("Sample text").result()
+    >>> batcher.close()
+    """
+
+    def __init__(self, process_batch: Callable[[List[Any]], Any],
+                 max_batch_size: int = 64,
+                 max_batch_duration_secs: float = 0.005,
+                 name: str = "dynamic-batcher"):
+        self._process_batch = process_batch
+        self.max_batch_size = max_batch_size
+        self.max_batch_duration_secs = max_batch_duration_secs
+        self._queue: "queue.Queue[Optional[Tuple[Any, Future]]]" = queue.Queue()
+        self._thread = threading.Thread(target=self._worker, name=name, daemon=True)
+        self._thread.start()
+
+    def submit(self, item: Any) -> Future:
+        """Queue one item; the returned future resolves to its result."""
+        future: Future = Future()
+        self._queue.put((item, future))
+        return future
+
+    def close(self) -> None:
+        """Stop the worker after draining queued items."""
+        self._queue.put(None)
+        self._thread.join()
+
+    def _worker(self) -> None:
+        stopping = False
+        while not stopping:
+            first = self._queue.get()
+            if first is None:
+                return
+
+            batch = [first]
+            deadline = time.monotonic() + self.max_batch_duration_secs
+            while len(batch) < self.max_batch_size:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    entry = self._queue.get(timeout=remaining)
+                except queue.Empty:
+                    break
+                if entry is None:
+                    stopping = True
+                    break
+                batch.append(entry)
+
+            futures = [future for _, future in batch]
+            try:
+                results = self._process_batch([item for item, _ in batch])
+                # A short/long result list is a batch failure, not a silent drop.
+                pairs = list(zip(futures, results, strict=True))
+            except Exception as e:
+                for future in futures:
+                    future.set_exception(e)
+                continue
+
+            for future, result in pairs:
+                future.set_result(result)
 
 
 # ============================================================================
@@ -969,7 +1725,7 @@ class EmbeddingModelWrapper(UnifiedModelWrapper):
     - embedding_dim : int
         Vector dimension (e.g., 768)
     - quantization : str
-        "4bit" | "8bit" | "fp16"
+        "4bit" | "8bit" | "fp16" (4/8-bit via bitsandbytes, CUDA only)
     - device : str
         "cpu" | "cuda"
     - cache_dir : str
@@ -978,11 +1734,21 @@ class EmbeddingModelWrapper(UnifiedModelWrapper):
         L2-normalize vectors (default: True)
     - max_length : int, optional
         Max sequence length (default: 512)
+    - batch_window_ms : float, optional
+        Enables dynamic micro-batching of concurrent single-text invokes:
+        max wait to fuse requests into one forward pass (default: 0 = off)
+    - max_batch_size : int, optional
+        Max texts per fused forward pass (default: 64)
+    - torch_compile : bool, optional
+        torch.compile the encoder on CUDA (default: True)
+    - cuda_graphs : bool, optional
+        Capture one CUDA graph per length bucket instead of torch.compile
+        (static batch of max_batch_size rows; default: False)
 
     API
     ---
     invoke(text: str) -> Any  # Returns 1D vector (np.ndarray if numpy available)
-    invoke(texts: List[str]) -> Any  # Batch processing (List[np.ndarray] if numpy available)
+    invoke(texts: List[str]) -> Any  # Batch processing (2D np.ndarray, shape (N, dim))
     """
 
     def _load_model(self) -> Any:
@@ -1002,7 +1768,12 @@ class EmbeddingModelWrapper(UnifiedModelWrapper):
             raise ValueError(f"Embedding model {self.name} missing 'repo_id' or 'source'")
 
         device = torch.device(device_str)
-        dtype = torch.float16 if device.type != "cpu" else torch.float32
+        if device.type == "cpu":
+            dtype = torch.float32
+        elif device.type == "cuda" and torch.cuda.is_bf16_supported():
+            dtype = torch.bfloat16
+        else:
+            dtype = torch.float16
 
         logger.info(f"🔄 Loading embedding model: {repo_id} on {device_str}")
 
@@ -1011,15 +1782,20 @@ class EmbeddingModelWrapper(UnifiedModelWrapper):
             cache_dir=cache_dir
         )
 
+        quantization_config = self._quantization_config(device, dtype)
+
         model = AutoModel.from_pretrained(
             repo_id,
             cache_dir=cache_dir,
             torch_dtype=dtype,
             device_map="cpu" if device.type == "cpu" else "auto",
-            low_cpu_mem_usage=True
+            low_cpu_mem_usage=True,
+            quantization_config=quantization_config,
         )
 
-        model.to(device)
+        # bitsandbytes models are placed by device_map and can't be moved
+        if quantization_config is None:
+            model.to(device)
         model.eval()
 
         self._tokenizer = tokenizer
@@ -1028,11 +1804,25 @@ class EmbeddingModelWrapper(UnifiedModelWrapper):
         self._normalize = self.config.get("normalize", True)
         self._max_length = self.config.get("max_length", 512)
 
+        self._encode_eager = self._build_encode_fn(model, device, dtype)
+        self._encode_fn = self._encode_eager
+
+        # CUDA graphs per sequence bucket: {seq_len: (graph, ids, mask, out)}.
+        # Replaces torch.compile (reduce-overhead already records graphs).
+        self._graphs: Optional[Dict[int, Tuple[Any, Any, Any, Any]]] = None
+        self._graph_lock = threading.Lock()
+        if device.type == "cuda" and self.config.get("cuda_graphs", False):
+            self._graphs = {}
+        elif device.type == "cuda" and self.config.get("torch_compile", True):
+            self._encode_fn = torch.compile(
+                self._encode_eager, mode="reduce-overhead", fullgraph=False
+            )
+
         expected_dim = self.config.get("embedding_dim", 768)
         self._embedding_dim = expected_dim
 
         # Quick embedding test to validate dimension
-        with torch.no_grad():
+        with torch.inference_mode():
             sample_inputs = tokenizer(
                 ["dummy"],
                 padding=True,
@@ -1059,8 +1849,87 @@ class EmbeddingModelWrapper(UnifiedModelWrapper):
             self._normalize,
         )
 
+        max_batch_size = self.config.get("max_batch_size", 64)
+
+        # Reusable pinned host buffer for DMA-friendly device → host copies
+        self._pinned = None
+        self._pinned_lock = threading.Lock()
+        if device.type == "cuda":
+            self._pinned = torch.empty(
+                (max_batch_size, self._embedding_dim), dtype=torch.float32, pin_memory=True
+            )
+
+        # Dynamic micro-batching for concurrent single-text callers
+        batch_window_ms = self.config.get("batch_window_ms", 0)
+        self._batcher = None
+        if batch_window_ms > 0:
+            self._batcher = DynamicBatchManager(
+                self._encode_texts,
+                max_batch_size=max_batch_size,
+                max_batch_duration_secs=batch_window_ms / 1000.0,
+                name=f"{self.name}-batcher",
+            )
+
         return model
 
+    def _quantization_config(self, device: Any, dtype: Any) -> Any:
+        """
+        BitsAndBytesConfig for ``quantization: 8bit | 4bit`` on CUDA, else None.
+
+        Weights are quantized; activations run in ``dtype`` and the pooled
+        vectors are still normalized in FP32.
+        """
+        quantization = self.config.get("quantization", "fp16")
+        if quantization not in ("8bit", "4bit"):
+            return None
+
+        if device.type != "cuda":
+            logger.info(
+                "Quantization %s requested for %s but device is %s; loading unquantized",
+                quantization,
+                self.name,
+                device.type,
+            )
+            return None
+
+        try:
+            from transformers import BitsAndBytesConfig
+        except ImportError:
+            logger.warning("BitsAndBytesConfig unavailable, loading %s unquantized", self.name)
+            return None
+
+        if quantization == "8bit":
+            return BitsAndBytesConfig(load_in_8bit=True)
+
+        return BitsAndBytesConfig(
+            load_in_4bit=True,
+            bnb_4bit_compute_dtype=dtype,
+            bnb_4bit_quant_type="nf4",
+        )
+
+    def _build_encode_fn(self, model: Any, device: Any, dtype: Any) -> Callable[..., Any]:
+        """
+        Build the fused forward + masked mean-pool + L2-normalize function.
+
+        On CUDA the forward runs under autocast in the model dtype; the
+        pooled vectors are normalized in FP32.
+        """
+        import torch
+
+        normalize = self._normalize
+        use_autocast = device.type == "cuda"
+
+        def encode(input_ids: Any, attention_mask: Any) -> Any:
+            with torch.autocast(device_type=device.type, dtype=dtype, enabled=use_autocast):
+                hidden = model(input_ids=input_ids, attention_mask=attention_mask).last_hidden_state
+            mask = attention_mask.unsqueeze(-1).to(hidden.dtype)
+            pooled = ((hidden * mask).sum(dim=1) / mask.sum(dim=1).clamp(min=1)).float()
+            if normalize:
+                pooled = torch.nn.functional.normalize(pooled, p=2, dim=1)
+            return pooled
+
+        return encode
+
     def _invoke_sync(self, input: InputType, config: Optional[Dict] = None) -> Any:
         """
         Generate embeddings for text(s).
@@ -1075,10 +1944,8 @@ class EmbeddingModelWrapper(UnifiedModelWrapper):
         Returns
         -------
         np.ndarray (1D if input is str)
-        List[np.ndarray] (if input is List[str])
+        np.ndarray with shape (len(texts), dim) (if input is List[str])
         """
-        import torch
-
         # Normalize input
         if isinstance(input, str):
             texts = [input]
@@ -1094,34 +1961,151 @@ class EmbeddingModelWrapper(UnifiedModelWrapper):
             texts = [str(input)]
             single_input = True
 
-        # Generate embeddings
-        tokenizer = self._tokenizer
-        device = self._device
-        max_length = self._max_length
+        # Single text: fuse with concurrent callers when batching is enabled
+        if single_input and self._batcher is not None:
+            return self._batcher.submit(texts[0]).result()
+
+        embeddings = self._encode_texts(texts)
+
+        # Return based on input
+        if single_input:
+            return embeddings[0]  # 1D array
+        else:
+            return embeddings  # 2D array (N, dim)
+
+    def _encode_texts(self, texts: List[str]) -> Any:
+        """
+        Embed texts and return an (N, dim) array in input order.
 
-        inputs = tokenizer(
+        Texts are grouped by token length into power-of-two buckets
+        (32, 64, ..., max_length) and each bucket is padded only to its own
+        size, so short texts don't pay for the longest one. Pooling is
+        weighted by the attention mask, so padding never changes a text's
+        embedding.
+        """
+        encoded = self._tokenizer(
             texts,
-            padding=True,
             truncation=True,
-            max_length=max_length,
-            return_tensors="pt"
+            max_length=self._max_length,
         )
-        inputs = {k: v.to(device) for k, v in inputs.items()}
+        lengths = [len(ids) for ids in encoded["input_ids"]]
 
-        with torch.no_grad():
-            outputs = self.model(**inputs)
-            embeddings_tensor = outputs.last_hidden_state.mean(dim=1)
+        embeddings = np.empty((len(texts), self._embedding_dim), dtype=np.float32)
+        max_batch_size = self.config.get("max_batch_size", 64)
 
-            if self._normalize:
-                embeddings_tensor = torch.nn.functional.normalize(embeddings_tensor, p=2, dim=1)
+        for bucket_len, indices in _length_buckets(lengths, self._max_length, max_batch_size):
+            batch = self._tokenizer.pad(
+                {
+                    "input_ids": [encoded["input_ids"][i] for i in indices],
+                    "attention_mask": [encoded["attention_mask"][i] for i in indices],
+                },
+                padding="max_length",
+                max_length=bucket_len,
+                return_tensors="pt",
+            )
+            # Scatter back through the inverse permutation
+            self._copy_to_host(
+                self._encode_batch(batch["input_ids"], batch["attention_mask"]),
+                embeddings,
+                indices,
+            )
 
-        embeddings = embeddings_tensor.cpu().numpy()
+        return embeddings
 
-        # Return based on input
-        if single_input:
-            return embeddings[0]  # 1D array
-        else:
-            return list(embeddings)  # List of 1D arrays
+    def _copy_to_host(self, embeddings_tensor: Any, out: Any, indices: List[int]) -> None:
+        """Copy a batch of embeddings into rows ``indices`` of ``out``."""
+        if self._pinned is None:
+            out[indices] = embeddings_tensor.cpu().numpy()
+            return
+
+        import torch
+
+        with self._pinned_lock:
+            host = self._pinned[:embeddings_tensor.shape[0]]
+            host.copy_(embeddings_tensor, non_blocking=True)
+            torch.cuda.current_stream(embeddings_tensor.device).synchronize()
+            out[indices] = host.numpy()
+
+    def _encode_batch(self, input_ids: Any, attention_mask: Any) -> Any:
+        """Forward one padded batch through the encode function (device tensor)."""
+        import torch
+
+        input_ids = input_ids.to(self._device)
+        attention_mask = attention_mask.to(self._device)
+
+        with torch.inference_mode():
+            if self._graphs is not None:
+                return self._encode_with_graph(input_ids, attention_mask)
+
+            try:
+                embeddings_tensor = self._encode_fn(input_ids, attention_mask)
+            except Exception as e:
+                if self._encode_fn is self._encode_eager:
+                    raise
+                # torch.compile failures surface on first call: fall back to eager
+                logger.warning(f"Compiled encoder failed for {self.name}, using eager: {e}")
+                self._encode_fn = self._encode_eager
+                embeddings_tensor = self._encode_fn(input_ids, attention_mask)
+
+        return embeddings_tensor
+
+    def _encode_with_graph(self, input_ids: Any, attention_mask: Any) -> Any:
+        """
+        Replay the CUDA graph captured for this sequence bucket.
+
+        Graphs have a static shape of ``(max_batch_size, seq_len)``; unused
+        rows get a single attended token so they stay finite, and are
+        dropped from the result.
+        """
+        rows, seq_len = input_ids.shape
+
+        with self._graph_lock:
+            entry = self._graphs.get(seq_len)
+            if entry is None:
+                entry = self._capture_graph(seq_len)
+                self._graphs[seq_len] = entry
+            graph, static_ids, static_mask, static_out = entry
+
+            static_ids.zero_()
+            static_mask.zero_()
+            static_mask[:, 0] = 1
+            static_ids[:rows].copy_(input_ids, non_blocking=True)
+            static_mask[:rows].copy_(attention_mask, non_blocking=True)
+            graph.replay()
+
+            return static_out[:rows].clone()
+
+    def _capture_graph(self, seq_len: int) -> Tuple[Any, Any, Any, Any]:
+        """Warm up and capture the encode function for one sequence bucket."""
+        import torch
+
+        batch_size = self.config.get("max_batch_size", 64)
+        static_ids = torch.zeros((batch_size, seq_len), dtype=torch.long, device=self._device)
+        static_mask = torch.ones_like(static_ids)
+
+        # Warmup on a side stream (required before capture)
+        stream = torch.cuda.Stream(self._device)
+        stream.wait_stream(torch.cuda.current_stream(self._device))
+        with torch.cuda.stream(stream):
+            for _ in range(3):
+                self._encode_eager(static_ids, static_mask)
+        torch.cuda.current_stream(self._device).wait_stream(stream)
+
+        graph = torch.cuda.CUDAGraph()
+        with torch.cuda.graph(graph):
+            static_out = self._encode_eager(static_ids, static_mask)
+
+        logger.debug(f"Captured CUDA graph for {self.name} (seq_len={seq_len})")
+        return graph, static_ids, static_mask, static_out
+
+    def unload(self) -> None:
+        """Stop the micro-batching worker, release graphs and unload the model."""
+        batcher = getattr(self, "_batcher", None)
+        if batcher is not None:
+            batcher.close()
+            self._batcher = None
+        self._graphs = None
+        super().unload()
 
     def get_embedding(self, text: str) -> Any:
         """
@@ -1139,9 +2123,7 @@ class EmbeddingModelWrapper(UnifiedModelWrapper):
         -------
         np.ndarray with shape (len(texts), embedding_dim)
         """
-        import numpy as np
-        embeddings = self.invoke(texts)
-        return np.array(embeddings)
+        return self.invoke(texts)
 
 
 # ============================================================================
@@ -1160,6 +2142,8 @@ class ModelRegistry:
     Features
     --------
     - Singleton pattern (one global instance)
+    - Thread-safe (concurrent get_model calls share one wrapper)
+    - LRU eviction under a memory budget (see ``set_memory_budget``)
     - Lazy loading (models loaded on-demand)
     - Automatic caching (same instance if already loaded)
     - Config-driven (YAML > code)
@@ -1183,13 +2167,18 @@ class ModelRegistry:
     """
 
     _instance = None
-    _models: Dict[str, Any] = {}  # Any instead of UnifiedModelWrapper for CASCADE
+    _models: "OrderedDict[str, Any]" = OrderedDict()  # LRU order; Any for CASCADE
     _config: Optional[Dict] = None
+    _config_cache: Dict[Tuple[str, int], Dict] = {}  # (abs path, mtime_ns) → parsed YAML
+    _cls_lock = threading.RLock()
+    _min_free_bytes: Optional[int] = None  # Memory budget (None = no auto-eviction)
 
     def __new__(cls):
-        """Singleton pattern."""
+        """Singleton pattern (double-checked locking)."""
         if cls._instance is None:
-            cls._instance = super().__new__(cls)
+            with cls._cls_lock:
+                if cls._instance is None:
+                    cls._instance = super().__new__(cls)
         return cls._instance
 
     @classmethod
@@ -1197,16 +2186,29 @@ class ModelRegistry:
         """
         Load model configurations from YAML.
 
+        Parsed files are cached by (path, mtime), so reloading an unchanged
+        file costs a single ``stat``.
+
         Parameters
         ----------
         config_path : str
             Path to configuration file
         """
-        if not os.path.exists(config_path):
-            raise FileNotFoundError(f"Models config not found: {config_path}")
+        try:
+            mtime_ns = os.stat(config_path).st_mtime_ns
+        except FileNotFoundError:
+            raise FileNotFoundError(f"Models config not found: {config_path}") from None
+
+        key = (os.path.abspath(config_path), mtime_ns)
+        cached = cls._config_cache.get(key)
+        if cached is not None:
+            cls._config = cached
+            return
+
+        with open(config_path, 'rb') as f:
+            cls._config = yaml.load(f, Loader=_YAML_LOADER)
 
-        with open(config_path, 'r') as f:
-            cls._config = yaml.safe_load(f)
+        cls._config_cache[key] = cls._config
 
         logger.info(f"Loaded {len(cls._config)} model configurations")
 
@@ -1234,11 +2236,85 @@ class ModelRegistry:
         if cls._config is None:
             cls.load_config()
 
-        # Return from cache if exists
-        if name in cls._models:
-            logger.debug(f"Model {name} retrieved from cache")
-            return cls._models[name]
+        with cls._cls_lock:
+            # Return from cache if exists (mark as most recently used)
+            wrapper = cls._models.get(name)
+            if wrapper is not None:
+                cls._models.move_to_end(name)
+                logger.debug(f"Model {name} retrieved from cache")
+                return wrapper
+
+            wrapper = cls._create_wrapper(name)
+
+        # Make room for the new model before it gets loaded
+        cls.enforce_memory_budget(keep=name)
+
+        return wrapper
+
+    @classmethod
+    def set_memory_budget(cls, min_free_bytes: Optional[int]) -> None:
+        """
+        Set the free-memory floor that triggers LRU auto-unload.
 
+        When free memory (CUDA if available, otherwise system RAM) drops
+        below ``min_free_bytes``, least-recently-used loaded models are
+        unloaded until the floor is met. ``None`` disables auto-eviction.
+
+        Parameters
+        ----------
+        min_free_bytes : int or None
+            Minimum free memory to keep, in bytes
+        """
+        cls._min_free_bytes = min_free_bytes
+
+    @classmethod
+    def enforce_memory_budget(cls, keep: Optional[str] = None) -> List[str]:
+        """
+        Unload LRU models while free memory is below the budget.
+
+        Parameters
+        ----------
+        keep : str, optional
+            Model that must not be evicted (e.g. the one being requested)
+
+        Returns
+        -------
+        List[str]
+            Names of evicted models (LRU first)
+        """
+        if cls._min_free_bytes is None:
+            return []
+
+        evicted: List[str] = []
+        while True:
+            free = _free_memory_bytes()
+            if free is None or free >= cls._min_free_bytes:
+                break
+
+            with cls._cls_lock:
+                victim = next(
+                    (
+                        name for name, wrapper in cls._models.items()
+                        if name != keep and wrapper.is_loaded
+                    ),
+                    None,
+                )
+            if victim is None:
+                logger.warning(
+                    "Free memory %.0f MB below budget but no model left to evict",
+                    free / 1024 / 1024,
+                )
+                break
+
+            logger.info(f"Memory pressure: evicting LRU model {victim}")
+            cls.unload_model(victim)
+            evicted.append(victim)
+
+        return evicted
+
+    @classmethod
+    def _create_wrapper(cls, name: str) -> UnifiedModelWrapper:
+        """Create and cache the wrapper for ``name`` (caller holds _cls_lock)."""
         # Validate exists in config
         if name not in cls._config:
             available = ", ".join(cls._config.keys())
@@ -1298,9 +2374,11 @@ class ModelRegistry:
         name : str
             Model name
         """
-        if name in cls._models:
-            cls._models[name].unload()
-            del cls._models[name]
+        with cls._cls_lock:
+            wrapper = cls._models.pop(name, None)
+
+        if wrapper is not None:
+            wrapper.unload()
             logger.info(f"Model {name} unloaded from registry")
 
     @classmethod
@@ -1327,6 +2405,23 @@ class ModelRegistry:
         ]
 
 
+def _free_memory_bytes() -> Optional[int]:
+    """Free accelerator memory (CUDA) or available system RAM, in bytes."""
+    try:
+        import torch
+
+        if torch.cuda.is_available():
+            free, _total = torch.cuda.mem_get_info()
+            return int(free)
+    except ImportError:
+        pass
+
+    if psutil is not None:
+        return int(psutil.virtual_memory().available)
+
+    return None
+
+
 # ============================================================================
 # CASCADE WRAPPER - Oracle 3-Tier System (v3.4.0)
 # ============================================================================
@@ -1374,7 +2469,26 @@ class CascadeWrapper(Runnable):
     >>> response = cascade.invoke("Derive the mathematical proof for...")
     """
 
-    def __init__(self):
+    # Max concurrent tier-3 requests (matches the session's connection pool)
+    QWEN3_MAX_CONCURRENCY = 10
+
+    # Routing decisions remembered per normalized prompt
+    ROUTE_CACHE_SIZE = 1024
+
+    # ainvoke: start tier 1 while the router runs (most queries end up there).
+    # Off by default: cancelling the task doesn't stop its worker thread, so a
+    # discarded tier-1 generation keeps competing with the chosen tier for
+    # CPU. Enable only when tier 1 has spare compute (e.g. its own GPU).
+    SPECULATIVE_TIER1 = False
+
+    # Responses to repeated prompts, keyed by the exact prompt (surrounding
+    # whitespace stripped) and sampling params. Off by default (0 TTL): a hit
+    # replays one sampled answer to every caller of the shared instance for
+    # the whole TTL. Per call: config["no_cache"]. ``stream`` bypasses it.
+    RESPONSE_CACHE_SIZE = 1024
+    RESPONSE_CACHE_TTL = 0.0
+
+    def __init__(self, eager_tier1: bool = False):
         """
         Initialize CascadeWrapper.
 
@@ -1382,6 +2496,11 @@ class CascadeWrapper(Runnable):
             - confidence_router: To decide tier
             - lfm2, minicpm: Cascade models (via get_model)
             - qwen3: Via Ollama directly (QWEN3_MODEL_NAME)
+
+        Parameters
+        ----------
+        eager_tier1 : bool
+            Call ``warm_up`` on construction. Tiers 2-3 stay lazy.
         """
         self.name = "cascade"
         self.model_type = "text"
@@ -1393,14 +2512,58 @@ class CascadeWrapper(Runnable):
         self._router = None
         self._lfm2 = None
         self._minicpm = None
+        self._ollama_session = None
+
+        # Tier-3 endpoint, resolved once (not per call)
+        self._qwen3_url = os.getenv("OLLAMA_BASE_URL", "http://localhost:11434")
+        self._qwen3_model = os.getenv("QWEN3_MODEL_NAME", "qwen3:8b")
+        self._qwen3_endpoint = f"{self._qwen3_url}/api/generate"
+        self._qwen3_body_heads = {
+            stream: self._qwen3_body_head(stream, 0.7, 512) for stream in (False, True)
+        }
+
+        # LRU of router decisions (normalized prompt hash → decision)
+        self._route_cache: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        self._route_cache_lock = threading.Lock()
+        self._route_cache_hits = 0
+        self._route_cache_misses = 0
+
+        # Response cache (stripped prompt + sampling params → (response, stored_at))
+        self._response_cache: "OrderedDict[str, Tuple[str, float]]" = OrderedDict()
+        self._response_cache_lock = threading.Lock()
 
         logger.info("CascadeWrapper initialized (Oracle System v3.4.0)")
 
+        if eager_tier1:
+            self.warm_up()
+
+    def warm_up(self) -> threading.Thread:
+        """
+        Load the router and LFM2 in a background thread.
+
+        Call it explicitly (e.g. at application start-up) so the first query
+        doesn't pay the tier-1 load; ``get_cascade_wrapper`` never does.
+        Returns the daemon thread so callers can ``join`` it.
+        """
+        thread = threading.Thread(
+            target=self._warm_tier1, name="cascade-warm-tier1", daemon=True
+        )
+        thread.start()
+        return thread
+
+    def _warm_tier1(self) -> None:
+        """Load router + LFM2 ahead of the first query (background thread)."""
+        try:
+            self._get_router()
+            self._get_lfm2()._ensure_loaded()
+            logger.info("CASCADE tier 1 warmed up")
+        except Exception as e:
+            logger.warning(f"CASCADE tier 1 warm-up failed (will load lazily): {e}")
+
     def _get_router(self):
         """Lazy load confidence router."""
         if self._router is None:
-            from sarai_agi.cascade import get_confidence_router
-            self._router = get_confidence_router()
+            self._router = _cascade.get_confidence_router()
         return self._router
 
     def _get_lfm2(self):
@@ -1415,24 +2578,52 @@ class CascadeWrapper(Runnable):
             self._minicpm = get_model("minicpm")
         return self._minicpm
 
+    def _get_ollama_session(self):
+        """Lazy keep-alive session for tier-3 Ollama calls (one pool per cascade)."""
+        if self._ollama_session is None:
+            import requests
+            from urllib3.util.retry import Retry
+
+            # Transient gateway errors are retried on the same connection pool
+            # (cheap) before falling back to MiniCPM. Connection errors and
+            # read timeouts are not retried: those fall back immediately.
+            retry = Retry(
+                total=2,
+                connect=0,
+                read=0,
+                status=2,
+                backoff_factor=0.3,
+                status_forcelist=(502, 503, 504),
+                allowed_methods=frozenset({"POST"}),
+                raise_on_status=False,
+            )
+
+            session = requests.Session()
+            adapter = requests.adapters.HTTPAdapter(
+                pool_connections=10, pool_maxsize=self.QWEN3_MAX_CONCURRENCY, max_retries=retry
+            )
+            session.mount("http://", adapter)
+            session.mount("https://", adapter)
+            session.headers.update({
+                "Connection": "keep-alive",
+                "Accept-Encoding": "gzip",
+                "Content-Type": "application/json",
+            })
+            self._ollama_session = session
+        return self._ollama_session
+
     def _get_qwen3(self):
         """
         Lazy load Qwen-3 (tier 3).
 
         Uses Ollama directly with QWEN3_MODEL_NAME.
         Doesn't need entry in models.yaml because Ollama
-        configuration already exists.
+        configuration already exists. Values are resolved in ``__init__``.
         """
         # TODO: Migrate config to sarai_agi.config
-        # from core.config import get_config
-        import os
-
-        ollama_url = os.getenv("OLLAMA_BASE_URL", "http://localhost:11434")
-        model_name = os.getenv("QWEN3_MODEL_NAME", "qwen3:8b")
-
         return {
-            "url": ollama_url,
-            "model": model_name
+            "url": self._qwen3_url,
+            "model": self._qwen3_model
         }
 
     def invoke(self, input: Union[str, Dict], config: Optional[Dict] = None) -> str:
@@ -1454,86 +2645,374 @@ class CascadeWrapper(Runnable):
         Flow
         ----
         1. Normalize input to string
-        2. Calculate confidence with router
-        3. Decide tier based on thresholds
-        4. Execute tier model
-        5. Return response
+        2. Return cached response for a repeated prompt (if any)
+        3. Calculate confidence with router
+        4. Decide tier based on thresholds
+        5. Execute tier model
+        6. Return response
         """
         self.last_access = time.time()
 
         # 1. Normalize input
+        prompt = self._normalize_input(input)
+
+        # 2. Response cache
+        cache_key = self._response_cache_key(prompt, config)
+        cached = self._get_cached_response(cache_key)
+        if cached is not None:
+            return cached
+
+        response = self._invoke_routed(prompt, config)
+        self._store_response(cache_key, response)
+        return response
+
+    def _invoke_routed(self, prompt: str, config: Optional[Dict] = None) -> str:
+        """Route ``prompt`` and run it on the chosen tier (no response cache)."""
+        # 3. Calculate confidence
+        target_model = self._route(prompt)
+
+        # 4-5. Execute based on tier
+        if target_model == "lfm2":
+            # TIER 1: LFM2 (≥0.6 confidence) - 80% of cases
+            return self._get_lfm2().invoke(prompt, config)
+
+        if target_model == "minicpm":
+            # TIER 2: MiniCPM (0.3-0.6 confidence) - 18% of cases
+            return self._get_minicpm().invoke(prompt, config)
+
+        # TIER 3: Qwen-3 (<0.3 confidence) - 2% of cases
+        return self._invoke_qwen3(prompt, config)
+
+    @staticmethod
+    def _normalize_input(input: Union[str, Dict]) -> str:
+        """Extract the prompt string from str or {"input": str}."""
         if isinstance(input, dict):
-            prompt = input.get("input", str(input))
-        else:
-            prompt = str(input)
+            return input.get("input", str(input))
+        return str(input)
 
-        # 2. Calculate confidence
-        router = self._get_router()
-        decision = router.calculate_confidence(prompt)
+    def _route(self, prompt: str) -> str:
+        """Ask the confidence router which tier should answer ``prompt``."""
+        decision = self._cached_route(prompt)
         confidence_score = decision["confidence_score"]
         target_model = decision["target_model"]
 
         logger.info(
             f"CASCADE: confidence={confidence_score:.2f} → tier={target_model}"
         )
+        return target_model
 
-        # 3. Execute based on tier
-        if target_model == "lfm2":
-            # TIER 1: LFM2 (≥0.6 confidence) - 80% of cases
-            model = self._get_lfm2()
-            response = model.invoke(prompt, config)
+    def _response_cache_key(self, prompt: str, config: Optional[Dict]) -> Optional[str]:
+        """Response-cache key (None when caching is off for this call)."""
+        if self.RESPONSE_CACHE_TTL <= 0 or (config and config.get("no_cache")):
+            return None
+        temperature = config.get("temperature") if config else None
+        max_tokens = config.get("max_tokens") if config else None
+        return _prompt_key(f"{prompt.strip()}\x00{temperature}\x00{max_tokens}")
+
+    def _get_cached_response(self, key: Optional[str]) -> Optional[str]:
+        """Return a fresh cached response for ``key`` (expired entries are dropped)."""
+        if key is None:
+            return None
+
+        with self._response_cache_lock:
+            entry = self._response_cache.get(key)
+            if entry is None:
+                return None
+            response, stored_at = entry
+            if time.monotonic() - stored_at > self.RESPONSE_CACHE_TTL:
+                del self._response_cache[key]
+                return None
+            self._response_cache.move_to_end(key)
+
+        logger.debug("CASCADE response cache hit")
+        return response
 
-        elif target_model == "minicpm":
-            # TIER 2: MiniCPM (0.3-0.6 confidence) - 18% of cases
-            model = self._get_minicpm()
-            response = model.invoke(prompt, config)
+    def _store_response(self, key: Optional[str], response: str) -> None:
+        """Remember ``response`` under ``key`` (bounded LRU)."""
+        if key is None:
+            return
 
-        else:  # target_model == "qwen3"
-            # TIER 3: Qwen-3 (<0.3 confidence) - 2% of cases
-            # Direct Ollama call
-            import requests
+        with self._response_cache_lock:
+            self._response_cache[key] = (response, time.monotonic())
+            self._response_cache.move_to_end(key)
+            while len(self._response_cache) > self.RESPONSE_CACHE_SIZE:
+                self._response_cache.popitem(last=False)
 
-            qwen3_config = self._get_qwen3()
-            ollama_response = requests.post(
-                f"{qwen3_config['url']}/api/generate",
-                json={
-                    "model": qwen3_config['model'],
-                    "prompt": prompt,
-                    "stream": False,
-                    "options": {
-                        "temperature": config.get("temperature", 0.7) if config else 0.7,
-                        "num_predict": config.get("max_tokens", 512) if config else 512,
-                    }
-                },
+    def _is_route_cached(self, prompt: str) -> bool:
+        """Whether the router decision for ``prompt`` is already cached."""
+        with self._route_cache_lock:
+            return _prompt_key(prompt.strip().lower()) in self._route_cache
+
+    def _cached_route(self, prompt: str) -> Dict[str, Any]:
+        """
+        Router decision for ``prompt``, memoized by normalized prompt.
+
+        Retries and chat refreshes repeat prompts; a hit skips the router's
+        classification entirely.
+        """
+        key = _prompt_key(prompt.strip().lower())
+
+        with self._route_cache_lock:
+            decision = self._route_cache.get(key)
+            if decision is not None:
+                self._route_cache.move_to_end(key)
+                self._route_cache_hits += 1
+                logger.debug(
+                    f"CASCADE route cache hit (hits={self._route_cache_hits}, "
+                    f"misses={self._route_cache_misses})"
+                )
+                return decision
+            self._route_cache_misses += 1
+
+        decision = self._get_router().calculate_confidence(prompt)
+
+        with self._route_cache_lock:
+            self._route_cache[key] = decision
+            while len(self._route_cache) > self.ROUTE_CACHE_SIZE:
+                self._route_cache.popitem(last=False)
+
+        return decision
+
+    def _invoke_qwen3(self, prompt: str, config: Optional[Dict] = None) -> str:
+        """Tier 3: direct Ollama call (pooled keep-alive connection)."""
+        try:
+            ollama_response = self._get_ollama_session().post(
+                self._qwen3_endpoint,
+                data=self._qwen3_body(prompt, config, stream=False),
                 timeout=120
             )
+        except OSError as e:  # requests.RequestException (refused, timeout, ...)
+            logger.warning(f"Qwen-3 unreachable ({e}), falling back to MiniCPM")
+            return self._get_minicpm().invoke(prompt, config)
 
-            if ollama_response.status_code == 200:
-                response = ollama_response.json()["response"]
-            else:
-                # Fallback to MiniCPM if Qwen-3 fails
-                logger.warning("Qwen-3 failed, falling back to MiniCPM")
-                model = self._get_minicpm()
-                response = model.invoke(prompt, config)
+        if ollama_response.status_code == 200:
+            return ollama_response.json()["response"]
 
-        return response
+        # Fallback to MiniCPM if Qwen-3 fails (after transport-level retries)
+        logger.warning(
+            f"Qwen-3 failed (HTTP {ollama_response.status_code}), falling back to MiniCPM"
+        )
+        return self._get_minicpm().invoke(prompt, config)
+
+    def _stream_qwen3(self, prompt: str, config: Optional[Dict] = None) -> Iterator[str]:
+        """Tier 3 streaming: yield Ollama NDJSON chunks as they arrive."""
+        try:
+            ollama_response = self._get_ollama_session().post(
+                self._qwen3_endpoint,
+                data=self._qwen3_body(prompt, config, stream=True),
+                timeout=120,
+                stream=True
+            )
+        except OSError as e:  # requests.RequestException (refused, timeout, ...)
+            logger.warning(f"Qwen-3 unreachable ({e}), falling back to MiniCPM")
+            yield from self._get_minicpm().stream(prompt, config)
+            return
+
+        try:
+            if ollama_response.status_code != 200:
+                # Fallback to MiniCPM if Qwen-3 fails (after transport-level retries)
+                logger.warning(
+                    f"Qwen-3 failed (HTTP {ollama_response.status_code}), falling back to MiniCPM"
+                )
+                yield from self._get_minicpm().stream(prompt, config)
+                return
+
+            for line in ollama_response.iter_lines():
+                if not line:
+                    continue
+                chunk = json.loads(line)
+                if chunk.get("response"):
+                    yield chunk["response"]
+                if chunk.get("done"):
+                    break
+        finally:
+            ollama_response.close()
+
+    def _qwen3_body(self, prompt: str, config: Optional[Dict], stream: bool) -> bytes:
+        """
+        Serialized tier-3 /api/generate request body.
+
+        Everything except the prompt is pre-serialized in ``__init__`` for the
+        default options; only the prompt (and non-default options) are
+        encoded per call.
+        """
+        temperature = config.get("temperature", 0.7) if config else 0.7
+        max_tokens = config.get("max_tokens", 512) if config else 512
+
+        if temperature == 0.7 and max_tokens == 512:
+            head = self._qwen3_body_heads[stream]
+        else:
+            head = self._qwen3_body_head(stream, temperature, max_tokens)
+
+        return (head + json.dumps(prompt) + "}").encode("utf-8")
+
+    def _qwen3_body_head(self, stream: bool, temperature: float, max_tokens: int) -> str:
+        """JSON body up to (not including) the prompt value."""
+        fixed = json.dumps({
+            "model": self._qwen3_model,
+            "stream": stream,
+            "options": {"temperature": temperature, "num_predict": max_tokens},
+        })
+        return fixed[:-1] + ', "prompt": '
 
     def stream(self, input: Union[str, Dict], config: Optional[Dict] = None) -> Iterator[str]:
         """
-        Streaming not directly supported in CASCADE.
+        Stream the routed tier's response.
 
-        Fallback: executes invoke() and returns as single chunk.
+        Routing happens up front; tiers 1-2 delegate to the submodel's
+        ``stream`` and tier 3 streams Ollama's NDJSON chunks, so the first
+        token arrives long before the full (up to ~15s) generation ends.
+        Streams neither read nor fill the response cache.
         """
-        response = self.invoke(input, config)
-        yield response
+        self.last_access = time.time()
+        prompt = self._normalize_input(input)
+
+        target_model = self._route(prompt)
+
+        if target_model == "lfm2":
+            yield from self._get_lfm2().stream(prompt, config)
+        elif target_model == "minicpm":
+            yield from self._get_minicpm().stream(prompt, config)
+        else:
+            yield from self._stream_qwen3(prompt, config)
 
     async def ainvoke(self, input: Union[str, Dict], config: Optional[Dict] = None) -> str:
-        """Async version (uses sync invoke for now)."""
-        return self.invoke(input, config)
+        """
+        Async CASCADE without blocking the event loop.
+
+        Tiers 1-2 delegate to the submodel's ``ainvoke``; the tier-3 HTTP call
+        runs in a worker thread on the pooled session, so concurrent callers
+        share keep-alive connections instead of serializing on the loop.
+        """
+        self.last_access = time.time()
+        prompt = self._normalize_input(input)
+
+        cache_key = self._response_cache_key(prompt, config)
+        cached = self._get_cached_response(cache_key)
+        if cached is not None:
+            return cached
+
+        response = await self._ainvoke_routed(prompt, config)
+        self._store_response(cache_key, response)
+        return response
+
+    async def _ainvoke_routed(self, prompt: str, config: Optional[Dict] = None) -> str:
+        """Async counterpart of ``_invoke_routed``."""
+        if self.SPECULATIVE_TIER1 and not self._is_route_cached(prompt):
+            return await self._ainvoke_speculative(prompt, config)
+
+        target_model = self._route(prompt)
+
+        if target_model == "lfm2":
+            return await self._get_lfm2().ainvoke(prompt, config)
+
+        if target_model == "minicpm":
+            return await self._get_minicpm().ainvoke(prompt, config)
+
+        return await asyncio.to_thread(self._invoke_qwen3, prompt, config)
+
+    async def _ainvoke_speculative(self, prompt: str, config: Optional[Dict] = None) -> str:
+        """
+        Route and run tier 1 concurrently; keep tier 1 only if the router agrees.
+
+        Hides the router latency on the dominant tier-1 path. If another tier
+        is chosen the speculative task is cancelled, but a generation already
+        running in a worker thread finishes in the background, discarded, and
+        contends with the chosen tier; hence ``SPECULATIVE_TIER1`` is opt-in.
+        """
+        route_task = asyncio.ensure_future(asyncio.to_thread(self._route, prompt))
+        spec_task = asyncio.ensure_future(self._get_lfm2().ainvoke(prompt, config))
+
+        try:
+            target_model = await route_task
+        except BaseException:
+            spec_task.cancel()
+            raise
+
+        if target_model == "lfm2":
+            return await spec_task
+
+        spec_task.cancel()
+
+        if target_model == "minicpm":
+            return await self._get_minicpm().ainvoke(prompt, config)
+
+        return await asyncio.to_thread(self._invoke_qwen3, prompt, config)
+
+    async def abatch(self, inputs: List[Union[str, Dict]],
+                     config: Optional[Dict] = None) -> List[str]:
+        """
+        Process inputs concurrently; results keep the order of ``inputs``.
+
+        Cached responses are served first; the remaining prompts are routed,
+        then each tier's group is dispatched at once (all groups
+        concurrently), so slow tier-3 calls overlap with the fast tier-1 ones.
+        """
+        self.last_access = time.time()
+        prompts = [self._normalize_input(inp) for inp in inputs]
+        cache_keys = [self._response_cache_key(prompt, config) for prompt in prompts]
+        cached = [self._get_cached_response(key) for key in cache_keys]
+
+        groups: Dict[str, List[int]] = {}
+        for index, prompt in enumerate(prompts):
+            if cached[index] is None:
+                groups.setdefault(self._route(prompt), []).append(index)
+
+        tiers = list(groups)
+        group_results = await asyncio.gather(*(
+            self._arun_tier(tier, [prompts[i] for i in groups[tier]], config)
+            for tier in tiers
+        ))
+
+        results: List[str] = [response or "" for response in cached]
+        for tier, responses in zip(tiers, group_results, strict=True):
+            for index, response in zip(groups[tier], responses, strict=True):
+                results[index] = response
+                self._store_response(cache_keys[index], response)
+        return results
+
+    async def _arun_tier(self, target_model: str, prompts: List[str],
+                         config: Optional[Dict] = None) -> List[str]:
+        """Run a group of prompts routed to the same tier."""
+        if target_model == "lfm2":
+            # Tier 1: one batched call (single forward pass where the backend
+            # supports it; llama.cpp runs them back to back on one context)
+            if len(prompts) == 1:
+                return [await self._get_lfm2().ainvoke(prompts[0], config)]
+            return list(await asyncio.to_thread(self._get_lfm2().invoke_batch, prompts, config))
+
+        if target_model == "minicpm":
+            model = self._get_minicpm()
+            return list(await asyncio.gather(*(model.ainvoke(p, config) for p in prompts)))
+
+        # Tier 3: bounded by the session pool so requests don't queue for a socket
+        semaphore = asyncio.Semaphore(self.QWEN3_MAX_CONCURRENCY)
+
+        async def call(prompt: str) -> str:
+            async with semaphore:
+                return await asyncio.to_thread(self._invoke_qwen3, prompt, config)
+
+        return list(await asyncio.gather(*(call(p) for p in prompts)))
 
     def batch(self, inputs: List[Union[str, Dict]], config: Optional[Dict] = None) -> List[str]:
-        """Process batch of inputs."""
-        return [self.invoke(inp, config) for inp in inputs]
+        """
+        Process batch of inputs concurrently.
+
+        Wall time is the slowest query rather than the sum. Uses ``abatch``
+        when no event loop is running; otherwise (called from async code)
+        fans out on a thread pool: submit everything first, then collect.
+        """
+        if len(inputs) <= 1:
+            return [self.invoke(inp, config) for inp in inputs]
+
+        try:
+            asyncio.get_running_loop()
+        except RuntimeError:
+            return asyncio.run(self.abatch(inputs, config))
+
+        with ThreadPoolExecutor(max_workers=min(len(inputs), 16)) as executor:
+            futures = [executor.submit(self.invoke, inp, config) for inp in inputs]
+            return [future.result() for future in futures]
 
     def unload(self) -> None:
         """
@@ -1545,30 +3024,58 @@ class CascadeWrapper(Runnable):
         self._lfm2 = None
         self._minicpm = None
         self._router = None
+        with self._route_cache_lock:
+            self._route_cache.clear()
+        with self._response_cache_lock:
+            self._response_cache.clear()
+        if self._ollama_session is not None:
+            self._ollama_session.close()
+            self._ollama_session = None
         logger.info("CascadeWrapper components unloaded")
 
 
+_CASCADE_INSTANCE: Optional[CascadeWrapper] = None
+_CASCADE_LOCK = threading.Lock()
+
+
 def get_cascade_wrapper() -> CascadeWrapper:
     """
-    Factory function to get CascadeWrapper.
+    Factory function to get the shared CascadeWrapper.
+
+    All callers (including legacy ``get_model("solar")``) share one
+    instance, so loaded tiers, router decisions and the tier-3 connection
+    pool are reused instead of rebuilt per call. Nothing is loaded here;
+    call ``warm_up()`` on the result to preload tier 1.
 
     Returns
     -------
     CascadeWrapper
-        CASCADE Oracle system instance
+        CASCADE Oracle system instance (singleton)
 
     Example
     -------
     >>> cascade = get_cascade_wrapper()
+    >>> cascade.warm_up()  # optional, at start-up
     >>> response = cascade.invoke("How does Python work?")
     """
-    return CascadeWrapper()
+    global _CASCADE_INSTANCE
+    if _CASCADE_INSTANCE is None:
+        with _CASCADE_LOCK:
+            if _CASCADE_INSTANCE is None:
+                _CASCADE_INSTANCE = CascadeWrapper()
+    return _CASCADE_INSTANCE
 
 
 # ============================================================================
 # CONVENIENCE FUNCTIONS
 # ============================================================================
 
+# Legacy model names served by CascadeWrapper (v3.4.0)
+_CASCADE_ALIASES: frozenset = frozenset({
+    "cascade", "expert", "expert_short", "expert_long",
+    "solar", "solar_short", "solar_long"
+})
+
 def get_model(name: str):
     """
     Convenience function to get model.
@@ -1593,12 +3100,7 @@ def get_model(name: str):
     >>> response = solar.invoke("What is Python?")
     """
     # v3.4.0: Legacy name mapping to CASCADE
-    cascade_aliases = [
-        "cascade", "expert", "expert_short", "expert_long",
-        "solar", "solar_short", "solar_long"
-    ]
-
-    if name in cascade_aliases:
+    if name in _CASCADE_ALIASES:
         logger.info(f"get_model('{name}') → CascadeWrapper (Oracle System)")
         return get_cascade_wrapper()
 
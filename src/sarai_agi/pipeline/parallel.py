@@ -26,12 +26,13 @@ que incluye la respuesta generada y metadatos de telemetría.
 from __future__ import annotations
 
 import asyncio
+import functools
 import logging
 import os
 import time
-from concurrent.futures import ThreadPoolExecutor
+from concurrent.futures import Future, ThreadPoolExecutor
 from dataclasses import dataclass, field
-from typing import Any, Awaitable, Callable, Dict, Optional, Tuple, Union
+from typing import Any, Awaitable, Callable, Dict, Optional, Set, Tuple, Union
 
 from ..configuration import get_section, load_settings
 
@@ -64,7 +65,7 @@ class PipelineDependencies:
     router: Optional[RouterCallable] = None
 
 
-@dataclass
+@dataclass(slots=True)
 class PipelineMetrics:
     """Pequeña estructura para exponer información de telemetría."""
 
@@ -93,7 +94,8 @@ class PipelineMetrics:
             "last_agent": self.last_agent,
             "prefetch_target": self.prefetch_target,
         }
-        payload.update(self.additional)
+        if self.additional:
+            payload.update(self.additional)
         return payload
 
 
@@ -107,24 +109,28 @@ class ParallelPipeline:
             defecto cargados desde ``config/default_settings.yaml``.
     """
 
+    # Umbrales del router por defecto.
+    _ALPHA_EXPERT = 0.7
+    _BETA_EMPATHY = 0.7
+
     def __init__(
         self,
         dependencies: PipelineDependencies,
         config: Optional[Dict[str, Any]] = None,
     ) -> None:
         self.dependencies = dependencies
+        self._has_emotion_work = dependencies.emotion_detector is not None
 
-        settings = load_settings()
-        pipeline_config = get_section(settings, "pipeline", default={
-            "enable_parallelization": True,
-            "min_input_length": 20,
-            "max_workers": None,
-        })
+        pipeline_config = dict(_pipeline_defaults())
         if config:
             pipeline_config.update(config)
 
         self.enable_parallel = bool(pipeline_config.get("enable_parallelization", True))
         self.min_input_length = int(pipeline_config.get("min_input_length", 0) or 0)
+        # Opt-in: en Python 3.12+ las tareas de emoción y prefetch empiezan de
+        # forma síncrona; las que terminan sin ceder el control no pasan por el
+        # planificador. El resto de tareas del bucle no se ve afectado.
+        self.eager_tasks = bool(pipeline_config.get("eager_tasks", False))
 
         max_workers_cfg = pipeline_config.get("max_workers")
         if max_workers_cfg is None:
@@ -139,6 +145,16 @@ class ParallelPipeline:
             max_workers=max_workers,
             thread_name_prefix="sarai-pipeline"
         )
+        # Emoción y prefetch (E/S) usan su propia cola para no competir con
+        # clasificación, pesos y enrutado (CPU) en la del executor principal.
+        io_workers = max(1, int(pipeline_config.get("io_workers") or 4))
+        self.io_executor = ThreadPoolExecutor(
+            max_workers=io_workers,
+            thread_name_prefix="sarai-pipeline-io"
+        )
+        # Trabajos enviados a los executors que aún no han terminado (incluye
+        # los de un ``run`` que lanzó una excepción o fue cancelado).
+        self._inflight: Set[Future] = set()
         self.metrics = PipelineMetrics()
 
     # ------------------------------------------------------------------
@@ -152,6 +168,9 @@ class ParallelPipeline:
         text_input = str(state.get("input", ""))
         run_parallel = self._should_run_parallel(text_input)
         loop = asyncio.get_running_loop()
+        # Un único reloj monotónico para toda la ejecución; las etapas
+        # contiguas reutilizan la marca final de la anterior como inicio.
+        now = loop.time
 
         # Tareas opcionales que podemos lanzar por adelantado.
         emotion_task: Optional[asyncio.Future] = None
@@ -160,103 +179,163 @@ class ParallelPipeline:
         emotion_result: Optional[Dict[str, Any]] = None
         prefetch_result: Optional[str] = None
 
-        start_global = time.perf_counter()
-
-        if run_parallel:
-            emotion_start = time.perf_counter()
-            emotion_task = loop.create_task(self._run_in_executor(self._detect_emotion, state.copy()))
-
-        classify_start = time.perf_counter()
-        scores = await self._run_in_executor(self._classify_intent, state)
-        self.metrics.classify_ms = _elapsed_ms(classify_start)
-        state.update(scores)
-
-        weights_start = time.perf_counter()
-        weights = await self._run_in_executor(self._compute_weights, state)
-        self.metrics.weights_ms = _elapsed_ms(weights_start)
-        state.update(weights)
-
-        if run_parallel:
-            prefetch_task = loop.create_task(self._run_in_executor(self._prefetch_model, state.copy()))
-
-        if not run_parallel:
-            emotion_start = time.perf_counter()
-            emotion_result = await self._run_in_executor(self._detect_emotion, state.copy())
-            self.metrics.emotion_ms = _elapsed_ms(emotion_start)
+        start_global = mark = now()
+
+        deps = self.dependencies
+        # Sin detector o sin audio la etapa de emoción se omite por completo.
+        emotion_work = self._has_emotion_work and state.get("audio_input") is not None
+        emotion_inline = emotion_work and _runs_inline(deps.emotion_detector)
+        if run_parallel and emotion_work and not emotion_inline:
+            emotion_start = mark
+            emotion_task = _create_task(
+                loop, self._run_in_io_executor(loop, self._detect_emotion, state), self.eager_tasks
+            )
+
+        # Clasificación + pesos en un solo salto al executor (los pesos
+        # dependen de las puntuaciones y se calculan justo después).
+        if _runs_inline(deps.trm_classifier) and _runs_inline(deps.mcp_weighter):
+            classify_ms, weights_ms = self._classify_and_weight(state)
+        else:
+            classify_ms, weights_ms = await self._run_in_executor(loop, self._classify_and_weight, state)
+        mark = now()
+        self.metrics.classify_ms = classify_ms
+        self.metrics.weights_ms = weights_ms
+
+        # La heurística por defecto (sin prefetcher) es trivial: va inline.
+        prefetch_inline = deps.prefetch_model is None or _runs_inline(deps.prefetch_model)
+        if run_parallel and not prefetch_inline:
+            prefetch_task = _create_task(
+                loop,
+                self._run_in_io_executor(loop, self._prefetch_model, self._prefetch_view(state)),
+                self.eager_tasks,
+            )
+
+        if not emotion_work:
+            self.metrics.emotion_ms = 0.0
+        elif emotion_inline:
+            emotion_result = self._detect_emotion(state)
+            mark, self.metrics.emotion_ms = _lap_ms(now, mark)
+        elif not run_parallel:
+            emotion_result = await self._run_in_io_executor(loop, self._detect_emotion, state)
+            mark, self.metrics.emotion_ms = _lap_ms(now, mark)
         else:
             emotion_result = await emotion_task if emotion_task else None
             if emotion_start is not None and emotion_task is not None:
-                self.metrics.emotion_ms = _elapsed_ms(emotion_start)
+                mark, self.metrics.emotion_ms = _lap_ms(now, emotion_start)
 
         if emotion_result:
             state["emotion"] = emotion_result
 
-        if not run_parallel:
-            prefetch_result = await self._run_in_executor(self._prefetch_model, state.copy())
+        if prefetch_task is not None:
+            prefetch_result = await prefetch_task
+        elif prefetch_inline:
+            prefetch_result = self._prefetch_model(state, len(text_input))
         else:
-            prefetch_result = await prefetch_task if prefetch_task else None
+            prefetch_result = await self._run_in_io_executor(loop, self._prefetch_model, state)
         self.metrics.prefetch_target = prefetch_result
 
-        routing_start = time.perf_counter()
-        agent_key = await self._run_in_executor(self._route_to_agent, state)
-        self.metrics.routing_ms = _elapsed_ms(routing_start)
+        # El prefetch (en paralelo o secuencial) no forma parte del enrutado.
+        mark = now()
+        if deps.router is None or _runs_inline(deps.router):
+            agent_key = self._route_to_agent(state)
+        else:
+            agent_key = await self._run_in_executor(loop, self._route_to_agent, state)
+        mark, self.metrics.routing_ms = _lap_ms(now, mark)
 
-        response, metadata = await self._generate_with_streaming(state, agent_key)
-        self.metrics.response_latency_ms = _elapsed_ms(start_global)
+        response, metadata = await self._generate_with_streaming(state, agent_key, mark, loop)
+        self.metrics.response_latency_ms = (now() - start_global) * 1000.0
         state["response"] = response
 
-        metadata_container = state.setdefault("metadata", {})
+        metadata_container = state.get("metadata")
         if not isinstance(metadata_container, dict):
             metadata_container = {}
             state["metadata"] = metadata_container
 
-        metadata_container.update({
-            "agent": agent_key,
-            "pipeline_metrics": self.metrics.to_payload(),
-            **metadata,
-        })
+        metadata_container["agent"] = agent_key
+        metadata_container["pipeline_metrics"] = self.metrics.to_payload()
+        metadata_container.update(metadata)
 
         return state
 
-    async def shutdown(self) -> None:
-        """Cierra el executor asociado."""
+    async def shutdown(self, wait: bool = True) -> None:
+        """Cierra los executors asociados.
+
+        Args:
+            wait: Si es ``True`` espera (fuera del bucle) a que terminen los
+                trabajos pendientes. Cuando no queda ninguno en curso, el
+                caso habitual tras un ``run`` completo, se cierran sin esperar.
+        """
 
+        if not wait or not self._inflight:
+            self.executor.shutdown(wait=False)
+            self.io_executor.shutdown(wait=False)
+            return
         loop = asyncio.get_running_loop()
-        await loop.run_in_executor(None, self.executor.shutdown)
+        await loop.run_in_executor(None, self.executor.shutdown, True)
+        await loop.run_in_executor(None, self.io_executor.shutdown, True)
 
     # ------------------------------------------------------------------
     # Etapas internas
     # ------------------------------------------------------------------
 
     def _should_run_parallel(self, text_input: str) -> bool:
-        if not self.enable_parallel:
-            return False
-        return len(text_input) >= self.min_input_length
+        # La longitud primero: las entradas cortas se descartan sin consultar
+        # ``enable_parallel``.
+        return len(text_input) >= self.min_input_length and self.enable_parallel
+
+    def _classify_and_weight(self, state: Dict[str, Any]) -> Tuple[float, float]:
+        """Clasifica y calcula pesos, actualizando ``state``.
+
+        Se ejecuta en el executor; devuelve ``(classify_ms, weights_ms)``
+        medidos dentro del propio hilo.
+        """
+
+        start = time.perf_counter_ns()
+        state.update(self._classify_intent(state))
+        middle = time.perf_counter_ns()
+        state.update(self._compute_weights(state))
+        end = time.perf_counter_ns()
+        return (middle - start) / 1_000_000.0, (end - middle) / 1_000_000.0
 
     def _classify_intent(self, state: Dict[str, Any]) -> Dict[str, float]:
         try:
             result = self.dependencies.trm_classifier(state)
-            if not isinstance(result, dict):
-                raise TypeError("El clasificador debe devolver un dict")
-            return result
         except Exception as exc:  # pragma: no cover - registro defensivo
             logger.exception("Fallo en el clasificador TRM: %s", exc)
             return {"hard": 0.5, "soft": 0.5}
+        if isinstance(result, dict):
+            return result
+        logger.error("El clasificador debe devolver un dict, recibido %s", type(result).__name__)
+        return {"hard": 0.5, "soft": 0.5}
 
     def _compute_weights(self, state: Dict[str, Any]) -> Dict[str, float]:
         try:
             result = self.dependencies.mcp_weighter(state)
             if not isinstance(result, dict):
-                raise TypeError("El MCP debe devolver un dict")
+                logger.error("El MCP debe devolver un dict, recibido %s", type(result).__name__)
+                return {"alpha": 0.5, "beta": 0.5}
             alpha = float(result.get("alpha", 0.5))
             beta = float(result.get("beta", max(0.0, 1.0 - alpha)))
-            total = alpha + beta
-            if total == 0:
-                return {"alpha": 0.5, "beta": 0.5}
-            return {"alpha": alpha / total, "beta": beta / total}
         except Exception as exc:  # pragma: no cover - registro defensivo
             logger.exception("Fallo en el MCP: %s", exc)
             return {"alpha": 0.5, "beta": 0.5}
+        total = alpha + beta
+        if total == 0:
+            return {"alpha": 0.5, "beta": 0.5}
+        return {"alpha": alpha / total, "beta": beta / total}
+
+    def _prefetch_view(self, state: Dict[str, Any]) -> Dict[str, Any]:
+        """Estado que recibe el prefetch cuando corre en paralelo.
+
+        Las etapas internas solo leen ``state`` (``input`` / ``audio_input``),
+        así que reciben el propio diccionario. Un prefetcher externo sí recibe
+        una copia: se ejecuta mientras ``run`` sigue escribiendo en ``state``
+        (p. ej. ``"emotion"``) y podría estar iterándolo.
+        """
+
+        if self.dependencies.prefetch_model is None:
+            return state
+        return state.copy()
 
     def _detect_emotion(self, state: Dict[str, Any]) -> Optional[Dict[str, Any]]:
         detector = self.dependencies.emotion_detector
@@ -269,12 +348,17 @@ class ParallelPipeline:
             logger.warning("Detector de emoción falló: %s", exc)
             return None
 
-    def _prefetch_model(self, state: Dict[str, Any]) -> Optional[str]:
+    def _prefetch_model(
+        self,
+        state: Dict[str, Any],
+        text_length: Optional[int] = None,
+    ) -> Optional[str]:
         prefetcher = self.dependencies.prefetch_model
         if not prefetcher:
             # Heurística mínima basada en la longitud del input: retornamos el
             # nombre del modelo con propósito informativo para los tests.
-            length = len(str(state.get("input", "")))
+            # ``run`` pasa la longitud ya calculada de ``text_input``.
+            length = len(str(state.get("input", ""))) if text_length is None else text_length
             if length > 400:
                 return "expert_long"
             if length > 150:
@@ -293,17 +377,26 @@ class ParallelPipeline:
                 return router(state)
             except Exception as exc:  # pragma: no cover
                 logger.warning("Router personalizado falló: %s", exc)
-        # Ruta por defecto sencilla.
-        alpha = float(state.get("alpha", 0.5))
-        beta = float(state.get("beta", 0.5))
-        if alpha >= 0.7:
+        # Ruta por defecto sencilla. ``_compute_weights`` ya normaliza
+        # ``alpha``/``beta`` a float, no hace falta volver a convertirlos.
+        alpha = state["alpha"] if "alpha" in state else 0.5
+        beta = state["beta"] if "beta" in state else 0.5
+        if alpha >= self._ALPHA_EXPERT:
             return "expert"
-        if beta >= 0.7:
+        if beta >= self._BETA_EMPATHY:
             return "empathy"
         return "balanced"
 
-    async def _generate_with_streaming(self, state: Dict[str, Any], agent_key: str) -> Tuple[str, Dict[str, Any]]:
-        start = time.perf_counter()
+    async def _generate_with_streaming(
+        self,
+        state: Dict[str, Any],
+        agent_key: str,
+        start: Optional[float] = None,
+        loop: Optional[asyncio.AbstractEventLoop] = None,
+    ) -> Tuple[str, Dict[str, Any]]:
+        now = (loop or asyncio.get_running_loop()).time
+        if start is None:
+            start = now()
         try:
             result = self.dependencies.response_generator(state, agent_key)
             if asyncio.iscoroutine(result):
@@ -312,7 +405,7 @@ class ParallelPipeline:
                 response = result
         except Exception as exc:  # pragma: no cover - registro defensivo
             logger.exception("Generador de respuestas falló: %s", exc)
-            errors_container = state.setdefault("errors", [])
+            errors_container = state.get("errors")
             if not isinstance(errors_container, list):
                 errors_container = []
                 state["errors"] = errors_container
@@ -321,15 +414,48 @@ class ParallelPipeline:
                 "reason": str(exc),
             })
             response = ""
-        duration = _elapsed_ms(start)
+        _, duration = _lap_ms(now, start)
         self.metrics.generation_ms = duration
         self.metrics.streaming_chunks = 1
         self.metrics.last_agent = agent_key
         return response, {"generation_ms": duration}
 
-    async def _run_in_executor(self, func: Callable[..., Any], *args: Any) -> Any:
-        loop = asyncio.get_running_loop()
-        return await loop.run_in_executor(self.executor, lambda: func(*args))
+    async def _run_in_executor(
+        self,
+        loop: asyncio.AbstractEventLoop,
+        func: Callable[..., Any],
+        *args: Any,
+    ) -> Any:
+        # ``loop`` lo resuelve ``run`` una sola vez y se pasa explícitamente
+        # (en lugar de guardarlo en ``self``) para no mezclar bucles.
+        return await self._submit(loop, self.executor, func, *args)
+
+    async def _run_in_io_executor(
+        self,
+        loop: asyncio.AbstractEventLoop,
+        func: Callable[..., Any],
+        *args: Any,
+    ) -> Any:
+        return await self._submit(loop, self.io_executor, func, *args)
+
+    def _submit(
+        self,
+        loop: asyncio.AbstractEventLoop,
+        executor: ThreadPoolExecutor,
+        func: Callable[..., Any],
+        *args: Any,
+    ) -> asyncio.Future:
+        """Equivalente a ``loop.run_in_executor`` que registra el trabajo.
+
+        El trabajo sale de ``_inflight`` cuando termina en su hilo, aunque
+        quien lo esperaba ya se haya cancelado; así ``shutdown`` sabe si el
+        pool está realmente inactivo.
+        """
+
+        job = executor.submit(func, *args)
+        self._inflight.add(job)
+        job.add_done_callback(self._inflight.discard)
+        return asyncio.wrap_future(job, loop=loop)
 
 
 # ---------------------------------------------------------------------------
@@ -365,8 +491,56 @@ def get_parallel_pipeline(
     return _GLOBAL_PIPELINE
 
 
-def _elapsed_ms(start: float) -> float:
-    return (time.perf_counter() - start) * 1000.0
+@functools.lru_cache(maxsize=1)
+def _pipeline_defaults() -> Dict[str, Any]:
+    """Sección ``pipeline`` de la configuración, leída una vez por proceso.
+
+    Quien la use debe copiarla antes de modificarla.
+    """
+
+    settings = load_settings()
+    return get_section(settings, "pipeline", default={
+        "enable_parallelization": True,
+        "min_input_length": 20,
+        "max_workers": None,
+        "io_workers": 4,
+        "eager_tasks": False,
+    })
+
+
+def _create_task(
+    loop: asyncio.AbstractEventLoop,
+    coro: Awaitable[Any],
+    eager: bool,
+) -> asyncio.Future:
+    """Crea una tarea de la pipeline, eager si se pide y es posible (3.12+).
+
+    Solo afecta a esta tarea: la factoría de tareas del bucle (que pertenece
+    a la aplicación anfitriona) no se modifica.
+    """
+
+    factory = getattr(asyncio, "eager_task_factory", None) if eager else None
+    if factory is not None:
+        return factory(loop, coro)
+    return loop.create_task(coro)
+
+
+def _runs_inline(func: Optional[Callable[..., Any]]) -> bool:
+    """Indica si una dependencia se declaró trivial (``func._sarai_inline = True``).
+
+    Las dependencias así marcadas se ejecutan directamente en el bucle de
+    eventos: para funciones de microsegundos, el salto al ``ThreadPoolExecutor``
+    cuesta más que la propia llamada.
+    """
+
+    return bool(getattr(func, "_sarai_inline", False))
+
+
+def _lap_ms(now: Callable[[], float], start: float) -> Tuple[float, float]:
+    """Devuelve ``(marca_actual, ms_desde_start)`` con una sola lectura del reloj."""
+
+    current = now()
+    return current, (current - start) * 1000.0
 
 
 __all__ = [
@@ -184,6 +184,41 @@ class TestConfidenceRouter:
         # Not code
         assert router.should_use_code_expert("What is Python?") is False
 
+    def test_merged_patterns_match_individual_patterns(self):
+        """Test merged category regexes agree with per-pattern matching"""
+        import re
+
+        samples = [
+            "no estoy seguro, quizás",
+            "i think so",
+            "42",
+            "sí, claramente",
+            "analiza en profundidad este tema",
+            "describe esta imagen por favor",
+            "genera una función en python",
+            "este código da error",
+            "hola",
+            "¿qué tal?",
+            "gracias por todo",
+            "nota: holanda",
+            "",
+        ]
+        categories = [
+            (ConfidenceRouter.LOW_CONFIDENCE_PATTERNS, ConfidenceRouter._LOW_CONFIDENCE_RE),
+            (ConfidenceRouter.HIGH_CONFIDENCE_PATTERNS, ConfidenceRouter._HIGH_CONFIDENCE_RE),
+            (ConfidenceRouter.FORCE_QWEN_PATTERNS, ConfidenceRouter._FORCE_QWEN_RE),
+            (ConfidenceRouter.VISUAL_TRIGGER_PATTERNS, ConfidenceRouter._VISUAL_TRIGGER_RE),
+            (ConfidenceRouter.VISION_PATTERNS_EXPLICIT, ConfidenceRouter._VISION_EXPLICIT_RE),
+            (ConfidenceRouter.CODE_EXPERT_PATTERNS, ConfidenceRouter._CODE_EXPERT_RE),
+            (ThinkModeClassifier.SIMPLE_PATTERNS, ThinkModeClassifier._SIMPLE_RE),
+            (ThinkModeClassifier.COMPLEX_PATTERNS, ThinkModeClassifier._COMPLEX_RE),
+        ]
+
+        for patterns, merged in categories:
+            for text in samples:
+                expected = any(re.search(p, text, re.IGNORECASE) for p in patterns)
+                assert bool(merged.search(text)) == expected, (merged.pattern, text)
+
     def test_legacy_should_escalate_to_qwen(self):
         """Test backward compatibility method"""
         router = ConfidenceRouter()
@@ -303,6 +338,21 @@ class TestThinkModeClassifier:
 
         assert result in ["think", "no_think"]
 
+    def test_simple_prefixes_cover_simple_patterns(self):
+        """Test the startswith prefilter never hides a simple-pattern match"""
+        import re
+
+        prompts = [
+            "hola", "¿hola?", "hi there", "hello", "hey!", "qué tal", "¿cómo estás?",
+            "how are you", "gracias", "thanks a lot", "thank you", "sí", "no",
+            "ok", "vale", "sure", "nota: hola", "holanda", "explica esto",
+        ]
+
+        patterns = ThinkModeClassifier.SIMPLE_PATTERNS
+        for prompt in prompts:
+            if any(re.search(p, prompt, re.IGNORECASE) for p in patterns):
+                assert prompt.startswith(ThinkModeClassifier._SIMPLE_PREFIXES), prompt
+
     def test_singleton_pattern(self):
         """Test get_think_mode_classifier returns same instance"""
         classifier1 = get_think_mode_classifier()
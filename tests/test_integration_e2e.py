@@ -371,6 +371,7 @@ class TestPerformance:
 
         # Verificar que executor se cerró
         assert pipeline.executor._shutdown  # type: ignore[attr-defined]
+        assert pipeline.io_executor._shutdown  # type: ignore[attr-defined]
 
 
 if __name__ == "__main__":
@@ -93,3 +93,282 @@ async def test_pipeline_prefetch_por_longitud():
     metrics = resultado["metadata"]["pipeline_metrics"]
     assert metrics["prefetch_target"] in {"expert_long", "expert_short", "tiny"}
 
+
+
+@pytest.mark.asyncio
+async def test_pipeline_metricas_de_tiempo_coherentes():
+    deps = _build_dependencies()
+    pipeline = create_parallel_pipeline(dependencies=deps, config={"enable_parallelization": False})
+
+    resultado = await pipeline.run({"input": "consulta tecnica"})
+    await pipeline.shutdown()
+
+    metrics = resultado["metadata"]["pipeline_metrics"]
+    etapas = ("classify_ms", "weights_ms", "emotion_ms", "routing_ms", "generation_ms")
+    assert all(metrics[etapa] >= 0.0 for etapa in etapas)
+    # Las etapas secuenciales comparten marcas de reloj: su suma no supera el total.
+    assert sum(metrics[etapa] for etapa in etapas) <= metrics["response_latency_ms"] + 1e-6
+
+
+@pytest.mark.asyncio
+async def test_pipeline_dependencias_inline_no_usan_executor():
+    deps = _build_dependencies()
+    for func in (deps.trm_classifier, deps.mcp_weighter, deps.router):
+        func._sarai_inline = True
+    pipeline = create_parallel_pipeline(dependencies=deps, config={"enable_parallelization": True, "min_input_length": 5})
+
+    async def _sin_executor(loop, func, *args):
+        raise AssertionError(f"{func.__name__} no debería pasar por el executor")
+
+    pipeline._run_in_executor = _sin_executor
+    resultado = await pipeline.run({"input": "consulta tecnica"})
+    await pipeline.shutdown()
+
+    assert resultado["metadata"]["agent"] == "expert"
+
+
+@pytest.mark.asyncio
+async def test_pipeline_eager_tasks_opcional(monkeypatch):
+    import asyncio
+
+    creadas = []
+
+    def factoria(loop, coro):
+        creadas.append(coro)
+        return loop.create_task(coro)
+
+    monkeypatch.setattr(asyncio, "eager_task_factory", factoria, raising=False)
+
+    deps = _build_dependencies()
+    deps.emotion_detector = lambda audio: {"label": "calma"}
+    deps.prefetch_model = lambda state: "tiny"
+    pipeline = create_parallel_pipeline(
+        dependencies=deps,
+        config={"enable_parallelization": True, "min_input_length": 5, "eager_tasks": True},
+    )
+
+    resultado = await pipeline.run({"input": "consulta tecnica", "audio_input": b"\x00"})
+    await pipeline.shutdown()
+
+    assert resultado["metadata"]["agent"] == "expert"
+    # Solo las tareas de emoción y prefetch son eager; el bucle queda intacto.
+    assert len(creadas) == 2
+    assert asyncio.get_running_loop().get_task_factory() is None
+
+
+@pytest.mark.asyncio
+async def test_pipeline_omite_emocion_sin_audio():
+    llamadas = []
+
+    def detector(audio):
+        llamadas.append(audio)
+        return {"label": "calma"}
+
+    deps = _build_dependencies()
+    deps.emotion_detector = detector
+    pipeline = create_parallel_pipeline(dependencies=deps, config={"enable_parallelization": True, "min_input_length": 5})
+
+    sin_audio = await pipeline.run({"input": "consulta tecnica"})
+    assert llamadas == []
+    assert "emotion" not in sin_audio
+    assert sin_audio["metadata"]["pipeline_metrics"]["emotion_ms"] == 0.0
+
+    con_audio = await pipeline.run({"input": "consulta tecnica", "audio_input": b"\x00"})
+    await pipeline.shutdown()
+
+    assert llamadas == [b"\x00"]
+    assert con_audio["emotion"] == {"label": "calma"}
+
+
+@pytest.mark.asyncio
+async def test_pipeline_router_por_defecto():
+    deps = _build_dependencies()
+    deps.router = None
+    pipeline = create_parallel_pipeline(dependencies=deps, config={"enable_parallelization": False})
+
+    experto = await pipeline.run({"input": "consulta tecnica"})
+    empatia = await pipeline.run({"input": "tema de emocion"})
+    equilibrado = await pipeline.run({"input": "hola"})
+    await pipeline.shutdown()
+
+    assert experto["metadata"]["agent"] == "expert"
+    assert empatia["metadata"]["agent"] == "empathy"
+    assert equilibrado["metadata"]["agent"] == "balanced"
+
+
+@pytest.mark.asyncio
+async def test_pipeline_emocion_y_prefetch_en_executor_io():
+    import threading
+
+    hilos = {}
+
+    def detector(audio):
+        hilos["emotion"] = threading.current_thread().name
+        return None
+
+    def prefetcher(state):
+        hilos["prefetch"] = threading.current_thread().name
+        return "tiny"
+
+    deps = _build_dependencies()
+    deps.emotion_detector = detector
+    deps.prefetch_model = prefetcher
+    pipeline = create_parallel_pipeline(dependencies=deps, config={"enable_parallelization": True, "min_input_length": 5})
+
+    await pipeline.run({"input": "consulta tecnica", "audio_input": b"\x00"})
+    await pipeline.shutdown()
+
+    assert hilos["emotion"].startswith("sarai-pipeline-io")
+    assert hilos["prefetch"].startswith("sarai-pipeline-io")
+
+
+@pytest.mark.asyncio
+async def test_pipeline_clasificador_invalido_usa_valores_por_defecto():
+    deps = _build_dependencies()
+    deps.trm_classifier = lambda state: ["no", "es", "dict"]
+    deps.mcp_weighter = lambda state: {"alpha": "no-numerico"}
+    pipeline = create_parallel_pipeline(dependencies=deps, config={"enable_parallelization": False})
+
+    resultado = await pipeline.run({"input": "consulta tecnica"})
+    await pipeline.shutdown()
+
+    assert resultado["hard"] == resultado["soft"] == 0.5
+    assert resultado["alpha"] == resultado["beta"] == 0.5
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("paralelo", [False, True])
+async def test_pipeline_dependencias_caidas_usan_valores_por_defecto(paralelo):
+    def caida(state):
+        raise ConnectionError("servicio no disponible")
+
+    deps = _build_dependencies()
+    deps.trm_classifier = caida
+    deps.prefetch_model = caida
+    deps.router = caida
+    pipeline = create_parallel_pipeline(
+        dependencies=deps,
+        config={"enable_parallelization": paralelo, "min_input_length": 5},
+    )
+
+    resultado = await pipeline.run({"input": "consulta tecnica"})
+    await pipeline.shutdown()
+
+    assert resultado["hard"] == resultado["soft"] == 0.5
+    assert resultado["metadata"]["agent"] == "balanced"
+    assert resultado["metadata"]["pipeline_metrics"]["prefetch_target"] is None
+
+
+@pytest.mark.asyncio
+async def test_pipeline_conserva_metadata_existente():
+    from collections import OrderedDict
+
+    deps = _build_dependencies()
+    pipeline = create_parallel_pipeline(dependencies=deps, config={"enable_parallelization": False})
+
+    previa = OrderedDict(origen="test")
+    resultado = await pipeline.run({"input": "consulta tecnica", "metadata": previa})
+    invalida = await pipeline.run({"input": "consulta tecnica", "metadata": "no-dict"})
+    await pipeline.shutdown()
+
+    assert resultado["metadata"] is previa
+    assert previa["origen"] == "test" and previa["agent"] == "expert"
+    assert invalida["metadata"]["agent"] == "expert"
+
+
+def test_pipeline_lee_configuracion_una_vez(monkeypatch):
+    from src.sarai_agi.pipeline import parallel
+
+    llamadas = []
+    original = parallel.load_settings
+
+    def _contar():
+        llamadas.append(1)
+        return original()
+
+    parallel._pipeline_defaults.cache_clear()
+    monkeypatch.setattr(parallel, "load_settings", _contar)
+    try:
+        primera = parallel.ParallelPipeline(_build_dependencies(), config={"min_input_length": 3})
+        segunda = parallel.ParallelPipeline(_build_dependencies())
+        primera.executor.shutdown()
+        primera.io_executor.shutdown()
+        segunda.executor.shutdown()
+        segunda.io_executor.shutdown()
+    finally:
+        parallel._pipeline_defaults.cache_clear()
+
+    assert len(llamadas) == 1
+    # La configuración de una instancia no contamina los valores por defecto.
+    assert primera.min_input_length == 3
+    assert segunda.min_input_length == 20
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("esperar", [False, True])
+async def test_pipeline_shutdown_cierra_executors(esperar):
+    pipeline = create_parallel_pipeline(dependencies=_build_dependencies(), config={"enable_parallelization": False})
+    await pipeline.run({"input": "consulta tecnica"})
+
+    # Tras un ``run`` completo no queda trabajo en curso.
+    assert not pipeline._inflight
+
+    await pipeline.shutdown(wait=esperar)
+
+    assert pipeline.executor._shutdown
+    assert pipeline.io_executor._shutdown
+
+
+@pytest.mark.asyncio
+async def test_pipeline_shutdown_espera_trabajos_de_un_run_cancelado():
+    import asyncio
+    import threading
+
+    empezado = threading.Event()
+    liberar = threading.Event()
+    terminado = []
+
+    def prefetcher(state):
+        empezado.set()
+        liberar.wait(1.0)
+        terminado.append(True)
+        return "tiny"
+
+    deps = _build_dependencies()
+    deps.prefetch_model = prefetcher
+    pipeline = create_parallel_pipeline(dependencies=deps, config={"enable_parallelization": False})
+
+    tarea = asyncio.ensure_future(pipeline.run({"input": "consulta tecnica"}))
+    while not empezado.is_set():
+        await asyncio.sleep(0.001)
+    tarea.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await tarea
+
+    # El prefetch sigue en su hilo: ``shutdown`` debe esperarlo.
+    asyncio.get_running_loop().call_later(0.02, liberar.set)
+    await pipeline.shutdown()
+
+    assert terminado == [True]
+    assert not pipeline._inflight
+
+
+@pytest.mark.asyncio
+async def test_pipeline_routing_ms_excluye_prefetch_secuencial():
+    import time
+
+    def prefetcher(state):
+        time.sleep(0.05)
+        return "tiny"
+
+    deps = _build_dependencies()
+    deps.prefetch_model = prefetcher
+    pipeline = create_parallel_pipeline(dependencies=deps, config={"enable_parallelization": False})
+
+    resultado = await pipeline.run({"input": "consulta tecnica"})
+    await pipeline.shutdown()
+
+    metrics = resultado["metadata"]["pipeline_metrics"]
+    assert metrics["prefetch_target"] == "tiny"
+    assert metrics["response_latency_ms"] >= 50.0
+    assert metrics["routing_ms"] < 25.0
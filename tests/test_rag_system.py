@@ -129,14 +129,17 @@ class TestWebCache:
             "precio de Bitcoin hoy",
             "noticias de ahora",
             "weather in London",
-            "stock price AAPL"
+            "stock price AAPL",
+            "precios de la luz"
         ]
 
         not_time_sensitive = [
             "historia de Roma",
             "tutorial de Python",
             "receta de paella",
-            "quién fue Einstein"
+            "quién fue Einstein",
+            "I know Python",
+            "snowboard para principiantes"
         ]
 
         for query in time_sensitive:
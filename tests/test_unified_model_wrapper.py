@@ -26,7 +26,14 @@ Date: November 4, 2025
 import pytest
 
 # Mock LangChain with proper base classes
+import asyncio
+import json
+import os
 import sys
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 from unittest.mock import MagicMock, Mock, patch
 
 # Mark tests that require various optional dependencies
@@ -43,12 +50,15 @@ import yaml
 # Import our modules (moved from later in file to fix E402)
 from sarai_agi.model.wrapper import (
     CascadeWrapper,
+    DynamicBatchManager,
     EmbeddingModelWrapper,
     GGUFModelWrapper,
     ModelRegistry,
+    MultimodalModelWrapper,
     OllamaModelWrapper,
     OpenAIAPIWrapper,
     TransformersModelWrapper,
+    _length_buckets,
     get_cascade_wrapper,
     get_model,
     list_available_models,
@@ -216,8 +226,8 @@ def mock_transformers_multimodal():
 @pytest.fixture
 def mock_ollama_server():
     """Mock Ollama API server"""
-    with patch('requests.get') as mock_get, \
-         patch('requests.post') as mock_post:
+    with patch('requests.Session.get') as mock_get, \
+         patch('requests.Session.post') as mock_post:
 
         # Mock /api/tags
         mock_get.return_value.status_code = 200
@@ -228,15 +238,26 @@ def mock_ollama_server():
             ]
         })
 
-        # Mock /api/generate
+        # Mock /api/generate (streamed NDJSON chunks)
         mock_post.return_value.status_code = 200
-        mock_post.return_value.json = Mock(return_value={
-            "response": "Ollama test response"
-        })
+        mock_post.return_value.iter_lines = Mock(side_effect=lambda: iter([
+            b'{"response": "Ollama test ", "done": false}',
+            b'',
+            b'{"response": "response", "done": false}',
+            b'{"response": "", "done": true}',
+        ]))
 
         yield mock_get, mock_post
 
 
+@pytest.fixture
+def fresh_cascade(monkeypatch):
+    """Fresh get_cascade_wrapper() singleton per test, with warm-up patched out"""
+    monkeypatch.setattr("sarai_agi.model.wrapper._CASCADE_INSTANCE", None)
+    with patch.object(CascadeWrapper, "warm_up") as warm_up:
+        yield warm_up
+
+
 @pytest.fixture
 def mock_openai():
     """Mock OpenAI client"""
@@ -304,6 +325,23 @@ class TestModelRegistry:
         assert "lfm2" in registry._config
         assert "embedding_gemma" in registry._config
 
+    def test_load_config_cached_until_file_changes(self, mock_config_yaml):
+        """Test unchanged YAML is parsed once and edits are picked up via mtime"""
+        registry = ModelRegistry()
+        registry.load_config(mock_config_yaml)
+        first = registry._config
+
+        registry.load_config(mock_config_yaml)
+        assert registry._config is first
+
+        with open(mock_config_yaml, "w") as f:
+            f.write("only_model:\n  backend: ollama\n")
+        stat = os.stat(mock_config_yaml)
+        os.utime(mock_config_yaml, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+
+        registry.load_config(mock_config_yaml)
+        assert list(registry._config) == ["only_model"]
+
     def test_singleton_pattern(self):
         """Test ModelRegistry is singleton"""
         registry1 = ModelRegistry()
@@ -346,6 +384,82 @@ class TestModelRegistry:
         with pytest.raises(ValueError, match="not found in config"):
             registry.get_model("unknown_model")
 
+    def test_concurrent_get_model_returns_single_wrapper(self, mock_config_yaml):
+        """Test concurrent get_model calls share one wrapper instance"""
+        registry = ModelRegistry()
+        registry.load_config(mock_config_yaml)
+        registry.unload_model("minicpm")
+
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            wrappers = list(executor.map(lambda _: registry.get_model("minicpm"), range(16)))
+
+        assert all(wrapper is wrappers[0] for wrapper in wrappers)
+
+    def test_concurrent_ensure_loaded_loads_once(self, mock_config_yaml):
+        """Test concurrent first invokes coalesce into a single _load_model"""
+        registry = ModelRegistry()
+        registry.load_config(mock_config_yaml)
+        config = registry._config["minicpm"]
+
+        calls = []
+
+        def slow_load():
+            calls.append(1)
+            time.sleep(0.05)
+            return None
+
+        wrapper = OllamaModelWrapper("minicpm", config)
+        with patch.object(wrapper, "_load_model", side_effect=slow_load):
+            with ThreadPoolExecutor(max_workers=8) as executor:
+                list(executor.map(lambda _: wrapper._ensure_loaded(), range(8)))
+
+        assert len(calls) == 1
+        assert wrapper.is_loaded
+
+    def test_memory_budget_evicts_lru_first(self, mock_config_yaml):
+        """Test memory pressure unloads least-recently-used loaded models"""
+        registry = ModelRegistry()
+        registry.load_config(mock_config_yaml)
+        registry.unload_all()
+
+        first = registry.get_model("minicpm")
+        second = registry.get_model("gpt4")
+        for wrapper in (first, second):
+            wrapper.is_loaded = True
+        registry.get_model("minicpm")  # minicpm becomes most recently used
+
+        # Memory frees up after one eviction
+        free_memory = iter([100, 10_000])
+        registry.set_memory_budget(1_000)
+        try:
+            with patch("sarai_agi.model.wrapper._free_memory_bytes",
+                       side_effect=lambda: next(free_memory)):
+                evicted = registry.enforce_memory_budget()
+        finally:
+            registry.set_memory_budget(None)
+
+        assert evicted == ["gpt4"]
+        assert "gpt4" not in registry._models
+        assert "minicpm" in registry._models
+
+    def test_memory_budget_never_evicts_requested_model(self, mock_config_yaml):
+        """Test the model being requested is kept even under pressure"""
+        registry = ModelRegistry()
+        registry.load_config(mock_config_yaml)
+        registry.unload_all()
+
+        registry.get_model("minicpm").is_loaded = True
+
+        registry.set_memory_budget(1_000)
+        try:
+            with patch("sarai_agi.model.wrapper._free_memory_bytes", return_value=10):
+                evicted = registry.enforce_memory_budget(keep="minicpm")
+        finally:
+            registry.set_memory_budget(None)
+
+        assert evicted == []
+        assert "minicpm" in registry._models
+
     def test_unload_model(self, mock_config_yaml, mock_llama_cpp):
         """Test unload_model removes from cache"""
         registry = ModelRegistry()
@@ -403,6 +517,31 @@ class TestGGUFModelWrapper:
             with pytest.raises(FileNotFoundError):
                 wrapper._ensure_loaded()
 
+    def test_concurrent_invokes_are_serialized(self, mock_config_yaml):
+        """Test threads sharing one llama.cpp instance never generate at once"""
+        registry = ModelRegistry()
+        registry.load_config(mock_config_yaml)
+        wrapper = GGUFModelWrapper("lfm2", registry._config["lfm2"])
+
+        active = []
+        overlaps = []
+
+        def fake_llama(prompt, **kwargs):
+            active.append(prompt)
+            overlaps.append(len(active))
+            time.sleep(0.005)
+            active.remove(prompt)
+            return {"choices": [{"text": f"out:{prompt}"}]}
+
+        wrapper.model = fake_llama
+        wrapper.is_loaded = True
+
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            results = list(executor.map(wrapper.invoke, [f"q{i}" for i in range(8)]))
+
+        assert results == [f"out:q{i}" for i in range(8)]
+        assert max(overlaps) == 1
+
 
 # ============================================================================
 # TEST CLASS 3: TransformersModelWrapper
@@ -447,6 +586,39 @@ class TestTransformersModelWrapper:
         call_kwargs = mock_model.from_pretrained.call_args[1]
         assert call_kwargs["load_in_4bit"] is True
 
+    def test_invoke_batch_single_padded_generate(self, mock_config_yaml):
+        """Test batched prompts are left-padded into one generate call"""
+        registry = ModelRegistry()
+        registry.load_config(mock_config_yaml)
+        wrapper = TransformersModelWrapper("solar_transformers", registry._config["solar_transformers"])
+
+        input_ids = Mock(shape=(2, 3))
+        tokenizer = Mock(pad_token_id=None, eos_token="</s>", padding_side="right")
+        sides = []
+
+        def tokenize(*args, **kwargs):
+            sides.append(tokenizer.padding_side)
+            return {"input_ids": Mock(to=Mock(return_value=input_ids))}
+
+        tokenizer.side_effect = tokenize
+        tokenizer.batch_decode = Mock(return_value=[" first ", "second\n"])
+        wrapper.tokenizer = tokenizer
+
+        outputs = np.arange(10).reshape(2, 5)
+        wrapper.model = Mock()
+        wrapper.model.generate = Mock(return_value=outputs)
+        wrapper.is_loaded = True
+
+        responses = wrapper.invoke_batch(["q1", "q2"])
+
+        assert responses == ["first", "second"]
+        assert sides == ["left"]
+        assert tokenizer.padding_side == "right"
+        assert tokenizer.pad_token == "</s>"
+        tokenizer.assert_called_once_with(["q1", "q2"], return_tensors="pt", padding=True)
+        wrapper.model.generate.assert_called_once()
+        np.testing.assert_array_equal(tokenizer.batch_decode.call_args[0][0], outputs[:, 3:])
+
 
 # ============================================================================
 # TEST CLASS 4: MultimodalModelWrapper
@@ -470,6 +642,246 @@ class TestMultimodalModelWrapper:
         """Test text-only fallback (integration test)"""
         pass
 
+    def test_load_images_preserves_frame_order(self, mock_config_yaml):
+        """Test concurrent frame decoding keeps input order and converts to RGB"""
+        registry = ModelRegistry()
+        registry.load_config(mock_config_yaml)
+        config = registry._config["qwen3_vl"]
+
+        fake_pil = MagicMock()
+        fake_pil.Image.open = Mock(
+            side_effect=lambda path: Mock(convert=Mock(return_value=f"rgb:{path}"))
+        )
+
+        wrapper = MultimodalModelWrapper("qwen3_vl", config)
+        frames = [f"frame_{i}.jpg" for i in range(5)]
+
+        with patch.dict(sys.modules, {"PIL": fake_pil, "PIL.Image": fake_pil.Image}):
+            images = wrapper._load_images(frames)
+            single = wrapper._load_images("photo.jpg")
+
+        assert images == [f"rgb:{frame}" for frame in frames]
+        assert single == ["rgb:photo.jpg"]
+
+    def test_decode_and_resize_downscales_large_images(self):
+        """Test images over the pixel budget are shrunk during decode"""
+        fake_pil = MagicMock()
+        large = Mock(size=(4000, 3000))
+        rgb = Mock(size=(1200, 900))
+        large.convert = Mock(return_value=rgb)
+        rgb.resize = Mock(return_value="resized")
+        fake_pil.Image.open = Mock(return_value=large)
+
+        with patch.dict(sys.modules, {"PIL": fake_pil, "PIL.Image": fake_pil.Image}):
+            result = MultimodalModelWrapper._decode_and_resize("big.jpg", max_pixels=1_000_000)
+
+        large.draft.assert_called_once_with("RGB", (1154, 866))
+        rgb.resize.assert_called_once()
+        assert rgb.resize.call_args[0][0] == (1154, 866)
+        assert result == "resized"
+
+    def test_decode_and_resize_keeps_small_images(self):
+        """Test images within the budget are only converted to RGB"""
+        fake_pil = MagicMock()
+        small = Mock(size=(640, 480))
+        small.convert = Mock(return_value="rgb")
+        fake_pil.Image.open = Mock(return_value=small)
+
+        with patch.dict(sys.modules, {"PIL": fake_pil, "PIL.Image": fake_pil.Image}):
+            result = MultimodalModelWrapper._decode_and_resize("small.jpg", max_pixels=1_000_000)
+
+        small.draft.assert_not_called()
+        assert result == "rgb"
+
+    def test_image_cache_key_is_content_based(self):
+        """Test image embedding cache key depends on pixel content, not identity"""
+        def fake_image(payload):
+            return Mock(mode="RGB", size=(2, 2), tobytes=Mock(return_value=payload))
+
+        key_a = MultimodalModelWrapper._image_cache_key([fake_image(b"aaaa")])
+        key_a_again = MultimodalModelWrapper._image_cache_key([fake_image(b"aaaa")])
+        key_b = MultimodalModelWrapper._image_cache_key([fake_image(b"bbbb")])
+
+        assert key_a == key_a_again
+        assert key_a != key_b
+
+        # Persisted keys are namespaced by repo + preprocessing version
+        key_other_repo = MultimodalModelWrapper._image_cache_key(
+            [fake_image(b"aaaa")], "other/repo:v1"
+        )
+        assert key_other_repo != key_a
+
+    def test_decode_new_tokens_skips_prompt_tokens(self, mock_config_yaml):
+        """Test only generated tokens are decoded (prompt sliced by token count)"""
+        registry = ModelRegistry()
+        registry.load_config(mock_config_yaml)
+        wrapper = MultimodalModelWrapper("qwen3_vl", registry._config["qwen3_vl"])
+        wrapper.processor = Mock()
+        wrapper.processor.decode = Mock(return_value="  answer \n")
+
+        outputs = [[101, 102, 103, 7, 8]]
+        result = wrapper._decode_new_tokens(outputs, input_len=3)
+
+        assert result == "answer"
+        wrapper.processor.decode.assert_called_once_with([7, 8], skip_special_tokens=True)
+
+    def test_to_device_pins_pixel_values_on_cuda(self, mock_config_yaml):
+        """Test inputs move in one non-blocking call with pinned pixel_values"""
+        registry = ModelRegistry()
+        registry.load_config(mock_config_yaml)
+        wrapper = MultimodalModelWrapper("qwen3_vl", registry._config["qwen3_vl"])
+        wrapper.model = Mock(device=Mock(type="cuda"))
+
+        pixel_values = Mock()
+        pixel_values.is_pinned = Mock(return_value=False)
+        inputs = MagicMock()
+        inputs.get = Mock(side_effect=lambda key: pixel_values if key == "pixel_values" else None)
+
+        wrapper._to_device(inputs)
+
+        pixel_values.pin_memory.assert_called_once()
+        inputs.__setitem__.assert_called_once_with("pixel_values", pixel_values.pin_memory())
+        inputs.to.assert_called_once_with(wrapper.model.device, non_blocking=True)
+
+    def test_text_inputs_cache_keeps_cpu_inputs(self, mock_config_yaml):
+        """Test cached text inputs stay on CPU and are moved to the device per use"""
+        registry = ModelRegistry()
+        registry.load_config(mock_config_yaml)
+        wrapper = MultimodalModelWrapper("qwen3_vl", registry._config["qwen3_vl"])
+        wrapper._text_inputs_cache = OrderedDict()
+        wrapper._text_inputs_lock = threading.Lock()
+        wrapper.processor = Mock(side_effect=lambda **kwargs: {"input_ids": "cpu"})
+        wrapper._to_device = Mock(side_effect=lambda inputs: {**inputs, "input_ids": "cuda"})
+
+        first = wrapper._text_inputs("Describe the scene")
+        second = wrapper._text_inputs("Describe the scene")
+
+        assert first == second == {"input_ids": "cuda"}
+        wrapper.processor.assert_called_once()
+        assert wrapper._to_device.call_count == 2
+        assert list(wrapper._text_inputs_cache.values()) == [{"input_ids": "cpu"}]
+
+    def test_image_embed_cache_requires_opt_in_and_supported_model(self, mock_config_yaml):
+        """Test the cached-embedding path is gated per model and per architecture"""
+        registry = ModelRegistry()
+        registry.load_config(mock_config_yaml)
+        config = registry._config["qwen3_vl"]
+        qwen2_vl = Mock(config=Mock(model_type="qwen2_vl"))
+        qwen3_vl = Mock(config=Mock(model_type="qwen3_vl"))
+
+        default = MultimodalModelWrapper("qwen3_vl", config)
+        opted_in = MultimodalModelWrapper("qwen3_vl", {**config, "cache_image_embeds": True})
+
+        assert default._supports_image_embed_cache(qwen2_vl) is False
+        assert opted_in._supports_image_embed_cache(qwen2_vl) is True
+        assert opted_in._supports_image_embed_cache(qwen3_vl) is False
+
+    def test_image_embed_cache_hit_miss_and_disk_store(self, mock_config_yaml):
+        """Test vision-tower outputs are reused from host memory and from the disk store"""
+
+        class FakeStore(dict):
+            """Dict-backed stand-in for the h5py file (rejects duplicate datasets)"""
+
+            def create_dataset(self, key, data):
+                if key in self:
+                    raise ValueError(f"Unable to create dataset (name already exists): {key}")
+                self[key] = data
+
+            def flush(self):
+                pass
+
+        registry = ModelRegistry()
+        registry.load_config(mock_config_yaml)
+        wrapper = MultimodalModelWrapper("qwen3_vl", registry._config["qwen3_vl"])
+        wrapper._img_embed_cache = OrderedDict()
+        wrapper._img_embed_cache_size = 4
+        wrapper._img_embed_lock = threading.Lock()
+        wrapper._img_embed_store = FakeStore()
+        wrapper._img_embed_store_pending = 0
+
+        stored = np.ones((4, 8), dtype=np.float32)
+        embeds = Mock(name="image_embeds")
+        host = embeds.cpu.return_value
+        host.float.return_value.numpy.return_value = stored
+        wrapper.model = Mock(device="cuda")
+        wrapper.model.get_image_features = Mock(return_value=embeds)
+
+        fake_torch = MagicMock()
+        fake_torch.cuda.is_available.return_value = False
+        image = Mock(mode="RGB", size=(2, 2), tobytes=Mock(return_value=b"pixels"))
+        inputs = {"pixel_values": "pv", "image_grid_thw": "thw"}
+
+        with patch.dict(sys.modules, {"torch": fake_torch}):
+            # Miss: vision tower runs and the result is persisted
+            assert wrapper._get_image_embeds(inputs, [image]) is embeds
+            # Hit: the LRU keeps the CPU copy and moves it to the device
+            assert list(wrapper._img_embed_cache.values()) == [host]
+            assert wrapper._get_image_embeds(inputs, [image]) is host.to.return_value
+            host.to.assert_called_once_with("cuda", non_blocking=True)
+            wrapper.model.get_image_features.assert_called_once_with("pv", "thw")
+            assert len(wrapper._img_embed_store) == 1
+            first_key = next(iter(wrapper._img_embed_store))
+
+            # Disk hit after the memory tier is dropped (e.g. a restart)
+            wrapper._img_embed_cache.clear()
+            from_disk = wrapper._get_image_embeds(inputs, [image])
+
+            # A concurrent miss whose key another caller stored meanwhile skips the write
+            other = Mock(mode="RGB", size=(2, 2), tobytes=Mock(return_value=b"other"))
+            other_key = wrapper._image_cache_key([other], "Qwen/Qwen3-VL-Test:v1")
+
+            def racing_get_image_features(*args):
+                wrapper._img_embed_store.create_dataset(other_key, data=stored)
+                return embeds
+
+            wrapper.model.get_image_features.side_effect = racing_get_image_features
+            assert wrapper._get_image_embeds(inputs, [other]) is embeds
+
+        np.testing.assert_array_equal(fake_torch.from_numpy.call_args[0][0], stored)
+        assert from_disk is fake_torch.from_numpy.return_value.to.return_value
+        assert wrapper.model.get_image_features.call_count == 2
+        assert set(wrapper._img_embed_store) == {first_key, other_key}
+        assert wrapper._img_embed_store_pending == 1
+
+    def test_locked_embed_store_falls_back_to_memory_cache(self, mock_config_yaml, tmp_path):
+        """Test an HDF5 file locked by another process doesn't fail the model load"""
+        registry = ModelRegistry()
+        registry.load_config(mock_config_yaml)
+        config = {**registry._config["qwen3_vl"], "image_cache_dir": str(tmp_path)}
+        wrapper = MultimodalModelWrapper("qwen3_vl", config)
+
+        fake_h5py = MagicMock()
+        fake_h5py.File.side_effect = OSError("Unable to lock file, errno = 11")
+
+        with patch.dict(sys.modules, {"h5py": fake_h5py}):
+            assert wrapper._open_embed_store() is None
+
+        fake_h5py.File.assert_called_once_with(
+            os.path.join(str(tmp_path), "vit_embeds.h5"), "a", libver="latest"
+        )
+
+    def test_video_tensor_skips_frame_decoding(self, mock_config_yaml):
+        """Test a pre-decoded video tensor goes straight to the processor"""
+        registry = ModelRegistry()
+        registry.load_config(mock_config_yaml)
+        wrapper = MultimodalModelWrapper("qwen3_vl", registry._config["qwen3_vl"])
+        wrapper.model = Mock()
+        wrapper.model.generate = Mock(return_value=[[1, 2, 3, 9]])
+        wrapper.processor = Mock()
+        wrapper.processor.decode = Mock(return_value="a cat")
+        wrapper._to_device = Mock(side_effect=lambda inputs: inputs)
+        wrapper._load_images = Mock()
+
+        video = Mock(name="tchw_tensor")
+        wrapper.processor.return_value = {"input_ids": Mock(shape=(1, 3))}
+
+        result = wrapper._process_with_video("What happens?", video)
+
+        assert result == "a cat"
+        wrapper._load_images.assert_not_called()
+        assert wrapper.processor.call_args.kwargs["videos"] == [video]
+        wrapper.processor.decode.assert_called_once_with([9], skip_special_tokens=True)
+
 
 # ============================================================================
 # TEST CLASS 5: OllamaModelWrapper
@@ -512,6 +924,103 @@ class TestOllamaModelWrapper:
         assert response == "Ollama test response"
         mock_post.assert_called()
 
+    def test_stream_yields_chunks(self, mock_config_yaml, mock_ollama_server, monkeypatch):
+        """Test stream() yields server chunks as they arrive"""
+        _, mock_post = mock_ollama_server
+
+        monkeypatch.setenv("OLLAMA_BASE_URL", "http://localhost:11434")
+        monkeypatch.setenv("MINICPM_MODEL_NAME", "minicpm:4b")
+
+        registry = ModelRegistry()
+        registry.load_config(mock_config_yaml)
+        config = registry._config["minicpm"]
+
+        wrapper = OllamaModelWrapper("minicpm", config)
+        chunks = list(wrapper.stream("Test prompt"))
+
+        assert chunks == ["Ollama test ", "response"]
+        assert mock_post.call_args.kwargs["stream"] is True
+        assert mock_post.call_args.kwargs["json"]["stream"] is True
+        mock_post.return_value.close.assert_called()
+
+    def test_invoke_reuses_pooled_session(self, mock_config_yaml, mock_ollama_server, monkeypatch):
+        """Test consecutive invokes share one keep-alive session"""
+        _, mock_post = mock_ollama_server
+
+        monkeypatch.setenv("OLLAMA_BASE_URL", "http://localhost:11434")
+        monkeypatch.setenv("MINICPM_MODEL_NAME", "minicpm:4b")
+
+        registry = ModelRegistry()
+        registry.load_config(mock_config_yaml)
+        config = registry._config["minicpm"]
+
+        wrapper = OllamaModelWrapper("minicpm", config)
+        wrapper.invoke("First prompt")
+        session = wrapper._http
+        wrapper.invoke("Second prompt")
+
+        assert wrapper._http is session
+        assert mock_post.call_count == 2
+
+        with patch.object(session, "close") as mock_close:
+            wrapper.unload()
+        mock_close.assert_called_once()
+        assert wrapper._http is None
+
+    def test_health_probe_uses_shared_session(self, mock_config_yaml, mock_ollama_server, monkeypatch):
+        """Test /api/tags probes from different wrappers share one module session"""
+        from sarai_agi.model import wrapper as wrapper_module
+
+        mock_get, _ = mock_ollama_server
+        monkeypatch.setenv("OLLAMA_BASE_URL", "http://localhost:11434")
+        monkeypatch.setenv("MINICPM_MODEL_NAME", "minicpm:4b")
+
+        registry = ModelRegistry()
+        registry.load_config(mock_config_yaml)
+        config = registry._config["minicpm"]
+
+        first = OllamaModelWrapper("minicpm", config)
+        second = OllamaModelWrapper("minicpm", config)
+        first._ensure_loaded()
+        second._ensure_loaded()
+
+        assert mock_get.call_count == 2
+        assert wrapper_module._ollama_probe_session() is wrapper_module._ollama_probe_session()
+        assert first._http is not wrapper_module._ollama_probe_session()
+
+    def test_think_mode_decision_memoized_per_prompt(self):
+        """Test repeated prompts reuse the think-mode decision"""
+        from sarai_agi.model.wrapper import _classify_think_mode
+
+        classifier = Mock()
+        classifier.classify = Mock(side_effect=lambda prompt: "think" if "solve" in prompt else "no_think")
+
+        assert _classify_think_mode("please solve x + 1 = 2 (memo test)", classifier) == "think"
+        assert _classify_think_mode("please solve x + 1 = 2 (memo test)", classifier) == "think"
+        assert _classify_think_mode("hello there (memo test)", classifier) == "no_think"
+
+        assert classifier.classify.call_count == 2
+
+    @pytest.mark.asyncio
+    async def test_ainvoke_many_preserves_order(self, mock_config_yaml, mock_ollama_server, monkeypatch):
+        """Test concurrent fan-out returns one response per prompt, in order"""
+        _, mock_post = mock_ollama_server
+
+        monkeypatch.setenv("OLLAMA_BASE_URL", "http://localhost:11434")
+        monkeypatch.setenv("MINICPM_MODEL_NAME", "minicpm:4b")
+
+        registry = ModelRegistry()
+        registry.load_config(mock_config_yaml)
+        config = registry._config["minicpm"]
+
+        wrapper = OllamaModelWrapper("minicpm", config)
+        wrapper._ensure_loaded()
+        responses = await wrapper.ainvoke_many(["a", "b", "c"])
+
+        assert responses == ["Ollama test response"] * 3
+        prompts = sorted(call.kwargs["json"]["prompt"] for call in mock_post.call_args_list)
+        assert prompts == ["a", "b", "c"]
+
     def test_env_var_resolution(self, mock_config_yaml, mock_ollama_server, monkeypatch):
         """Test environment variable resolution"""
         monkeypatch.setenv("OLLAMA_BASE_URL", "http://test-server:11434")
@@ -548,6 +1057,19 @@ class TestOpenAIAPIWrapper:
 
         assert wrapper.api_key == "sk-test-key-12345"
 
+    def test_load_model_missing_api_key_env_raises(self, mock_config_yaml, monkeypatch):
+        """Test unresolved ${VAR} API key raises ValueError"""
+        monkeypatch.delenv("OPENAI_API_KEY", raising=False)
+
+        registry = ModelRegistry()
+        registry.load_config(mock_config_yaml)
+        config = registry._config["gpt4"]
+
+        wrapper = OpenAIAPIWrapper("gpt4", config)
+
+        with pytest.raises(ValueError, match="OPENAI_API_KEY"):
+            wrapper._ensure_loaded()
+
     def test_invoke_generates_text(self, mock_config_yaml, mock_openai, monkeypatch):
         """Test text generation via OpenAI API"""
         monkeypatch.setenv("OPENAI_API_KEY", "sk-test-key")
@@ -562,6 +1084,26 @@ class TestOpenAIAPIWrapper:
         assert response == "OpenAI test response"
 
 
+    def test_client_reused_across_invokes(self, mock_config_yaml, monkeypatch):
+        """Test the OpenAI client (and its connection pool) is created once"""
+        monkeypatch.setenv("OPENAI_API_KEY", "sk-test-key")
+
+        fake_openai = MagicMock()
+        completion = Mock(choices=[Mock(message=Mock(content="pooled"))])
+        fake_openai.OpenAI.return_value.chat.completions.create = Mock(return_value=completion)
+
+        registry = ModelRegistry()
+        registry.load_config(mock_config_yaml)
+        config = registry._config["gpt4"]
+
+        wrapper = OpenAIAPIWrapper("gpt4", config)
+        with patch.dict(sys.modules, {"openai": fake_openai}):
+            assert wrapper.invoke("first") == "pooled"
+            assert wrapper.invoke("second") == "pooled"
+
+        fake_openai.OpenAI.assert_called_once()
+
+
 # ============================================================================
 # TEST CLASS 7: EmbeddingModelWrapper
 # ============================================================================
@@ -619,6 +1161,93 @@ class TestEmbeddingModelWrapper:
         assert embeddings.shape == (3, 768)
 
 
+class TestLengthBuckets:
+    """Test length bucketing for padded embedding batches"""
+
+    def test_groups_by_power_of_two(self):
+        """Test indices are grouped by rounded-up length, shortest first"""
+        buckets = _length_buckets([5, 40, 7, 100, 33], max_length=512, max_batch_size=64)
+
+        assert buckets == [(32, [0, 2]), (64, [1, 4]), (128, [3])]
+
+    def test_caps_at_max_length(self):
+        """Test buckets never exceed max_length"""
+        buckets = _length_buckets([300, 384], max_length=384, max_batch_size=64)
+
+        assert buckets == [(384, [0, 1])]
+
+    def test_splits_large_buckets(self):
+        """Test each chunk respects max_batch_size"""
+        buckets = _length_buckets([10] * 5, max_length=512, max_batch_size=2)
+
+        assert buckets == [(32, [0, 1]), (32, [2, 3]), (32, [4])]
+
+
+class TestDynamicBatchManager:
+    """Test micro-batching of concurrent single-item requests"""
+
+    def test_concurrent_submits_fused_into_one_batch(self):
+        """Test items queued within the window are processed together"""
+        batches = []
+
+        def process(items):
+            batches.append(list(items))
+            return [item.upper() for item in items]
+
+        batcher = DynamicBatchManager(process, max_batch_size=8, max_batch_duration_secs=0.2)
+        try:
+            futures = [batcher.submit(text) for text in ["a", "b", "c"]]
+            results = [future.result(timeout=5) for future in futures]
+        finally:
+            batcher.close()
+
+        assert results == ["A", "B", "C"]
+        assert batches == [["a", "b", "c"]]
+
+    def test_batch_size_limit(self):
+        """Test batches never exceed max_batch_size"""
+        batches = []
+
+        def process(items):
+            batches.append(len(items))
+            return items
+
+        batcher = DynamicBatchManager(process, max_batch_size=2, max_batch_duration_secs=0.2)
+        try:
+            futures = [batcher.submit(i) for i in range(5)]
+            results = [future.result(timeout=5) for future in futures]
+        finally:
+            batcher.close()
+
+        assert results == [0, 1, 2, 3, 4]
+        assert max(batches) <= 2
+
+    def test_errors_propagate_to_every_caller(self):
+        """Test a failing batch sets the exception on all futures"""
+        def process(items):
+            raise ValueError("boom")
+
+        batcher = DynamicBatchManager(process, max_batch_duration_secs=0.05)
+        try:
+            futures = [batcher.submit(i) for i in range(2)]
+            for future in futures:
+                with pytest.raises(ValueError, match="boom"):
+                    future.result(timeout=5)
+        finally:
+            batcher.close()
+
+    def test_result_count_mismatch_fails_every_caller(self):
+        """Test a batch returning the wrong number of rows fails all futures"""
+        batcher = DynamicBatchManager(lambda items: items[:-1], max_batch_duration_secs=0.2)
+        try:
+            futures = [batcher.submit(i) for i in range(2)]
+            for future in futures:
+                with pytest.raises(ValueError):
+                    future.result(timeout=5)
+        finally:
+            batcher.close()
+
+
 # ============================================================================
 # TEST CLASS 8: Factory Functions
 # ============================================================================
@@ -636,7 +1265,7 @@ class TestFactoryFunctions:
         assert isinstance(model, GGUFModelWrapper)
         assert model.name == "lfm2"
 
-    def test_get_model_cascade_alias(self, mock_config_yaml):
+    def test_get_model_cascade_alias(self, mock_config_yaml, fresh_cascade):
         """Test get_model returns CascadeWrapper for legacy names"""
         ModelRegistry.load_config(mock_config_yaml)
 
@@ -663,7 +1292,7 @@ class TestFactoryFunctions:
 class TestCascadeWrapper:
     """Test CASCADE Oracle system"""
 
-    def test_initialization(self):
+    def test_initialization(self, fresh_cascade):
         """Test CascadeWrapper initialization"""
         with patch('sarai_agi.cascade.get_confidence_router'):
             cascade = get_cascade_wrapper()
@@ -672,7 +1301,7 @@ class TestCascadeWrapper:
         assert cascade.backend == "cascade_system"
         assert cascade.is_loaded is True
 
-    def test_invoke_delegates_to_tier(self, mock_llama_cpp):
+    def test_invoke_delegates_to_tier(self, mock_llama_cpp, fresh_cascade):
         """Test invoke delegates to appropriate tier"""
         with patch('sarai_agi.cascade.get_confidence_router') as mock_router:
             # Mock router decision
@@ -695,7 +1324,381 @@ class TestCascadeWrapper:
 
         assert response == "Tier 1 response"
 
-    def test_tier_selection_by_confidence(self):
+    def test_tier3_reuses_keepalive_session(self):
+        """Test tier-3 Ollama calls share one pooled session until unload"""
+        router_instance = Mock()
+        router_instance.calculate_confidence = Mock(return_value={
+            "confidence_score": 0.1,
+            "target_model": "qwen3"
+        })
+
+        with patch('sarai_agi.cascade.get_confidence_router', return_value=router_instance), \
+             patch('requests.Session.post') as mock_post:
+            mock_post.return_value.status_code = 200
+            mock_post.return_value.json = Mock(return_value={"response": "Tier 3 response"})
+
+            cascade = CascadeWrapper()
+            assert cascade.invoke("Hard query") == "Tier 3 response"
+            session = cascade._ollama_session
+            assert cascade.invoke("Another hard query") == "Tier 3 response"
+
+        assert cascade._ollama_session is session
+        assert mock_post.call_count == 2
+
+        cascade.unload()
+        assert cascade._ollama_session is None
+
+    @pytest.mark.asyncio
+    async def test_ainvoke_awaits_tier_model(self):
+        """Test async CASCADE awaits the tier's native ainvoke"""
+        router_instance = Mock()
+        router_instance.calculate_confidence = Mock(return_value={
+            "confidence_score": 0.5,
+            "target_model": "minicpm"
+        })
+
+        with patch('sarai_agi.cascade.get_confidence_router', return_value=router_instance):
+            cascade = CascadeWrapper()
+            mock_minicpm = Mock()
+
+            async def fake_ainvoke(prompt, config=None):
+                return f"async:{prompt}"
+
+            mock_minicpm.ainvoke = fake_ainvoke
+            with patch.object(cascade, '_get_minicpm', return_value=mock_minicpm):
+                response = await cascade.ainvoke({"input": "Medium query"})
+
+        assert response == "async:Medium query"
+        mock_minicpm.invoke.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_concurrent_ainvoke_serializes_gguf_tier1(self):
+        """Test concurrent async calls never run the tier-1 llama.cpp instance at once"""
+        router_instance = Mock()
+        router_instance.calculate_confidence = Mock(return_value={
+            "confidence_score": 0.8,
+            "target_model": "lfm2"
+        })
+
+        active = []
+        overlaps = []
+
+        def fake_llama(prompt, **kwargs):
+            active.append(prompt)
+            overlaps.append(len(active))
+            time.sleep(0.005)
+            active.remove(prompt)
+            return {"choices": [{"text": f"t1:{prompt}"}]}
+
+        lfm2 = GGUFModelWrapper("lfm2", {"backend": "gguf", "model_path": "lfm2.gguf"})
+        lfm2.model = fake_llama
+        lfm2.is_loaded = True
+
+        with patch('sarai_agi.cascade.get_confidence_router', return_value=router_instance):
+            cascade = CascadeWrapper()
+            with patch.object(cascade, '_get_lfm2', return_value=lfm2):
+                prompts = [f"query {i}" for i in range(6)]
+                responses = await asyncio.gather(*(cascade.ainvoke(p) for p in prompts))
+
+        assert responses == [f"t1:{p}" for p in prompts]
+        assert max(overlaps) == 1
+
+    @pytest.mark.asyncio
+    async def test_ainvoke_speculative_tier1(self):
+        """Test tier 1 starts alongside routing and is discarded on another tier"""
+        decisions = {"easy": "lfm2", "hard": "minicpm"}
+        router_instance = Mock()
+        router_instance.calculate_confidence = Mock(side_effect=lambda prompt: {
+            "confidence_score": 0.5,
+            "target_model": decisions[prompt]
+        })
+
+        started = []
+
+        async def lfm2_ainvoke(prompt, config=None):
+            started.append(prompt)
+            await asyncio.sleep(0.01)
+            return f"t1:{prompt}"
+
+        async def minicpm_ainvoke(prompt, config=None):
+            return f"t2:{prompt}"
+
+        mock_lfm2 = Mock(ainvoke=lfm2_ainvoke)
+        mock_minicpm = Mock(ainvoke=minicpm_ainvoke)
+
+        with patch('sarai_agi.cascade.get_confidence_router', return_value=router_instance):
+            cascade = CascadeWrapper()
+            with patch.object(cascade, '_get_lfm2', return_value=mock_lfm2), \
+                 patch.object(cascade, '_get_minicpm', return_value=mock_minicpm), \
+                 patch.object(cascade, 'SPECULATIVE_TIER1', True):
+                assert await cascade.ainvoke("easy") == "t1:easy"
+                assert await cascade.ainvoke("hard") == "t2:hard"
+
+                # Cached decision: no speculation needed
+                assert await cascade.ainvoke("hard") == "t2:hard"
+
+        assert started == ["easy", "hard"]
+
+    def test_batch_runs_queries_concurrently(self):
+        """Test batch overlaps slow queries and preserves input order"""
+        router_instance = Mock()
+        router_instance.calculate_confidence = Mock(return_value={
+            "confidence_score": 0.5,
+            "target_model": "minicpm"
+        })
+
+        def slow_invoke(prompt, config=None):
+            time.sleep(0.2)
+            return f"answer:{prompt}"
+
+        mock_minicpm = Mock()
+        mock_minicpm.invoke = Mock(side_effect=slow_invoke)
+
+        async def slow_ainvoke(prompt, config=None):
+            return await asyncio.to_thread(slow_invoke, prompt, config)
+
+        mock_minicpm.ainvoke = slow_ainvoke
+
+        with patch('sarai_agi.cascade.get_confidence_router', return_value=router_instance):
+            cascade = CascadeWrapper()
+            with patch.object(cascade, '_get_minicpm', return_value=mock_minicpm):
+                start = time.perf_counter()
+                responses = cascade.batch(["q1", "q2", "q3", "q4"])
+                elapsed = time.perf_counter() - start
+
+        assert responses == ["answer:q1", "answer:q2", "answer:q3", "answer:q4"]
+        assert elapsed < 0.6
+
+    def test_batch_routes_all_then_dispatches_per_tier(self):
+        """Test batch groups prompts by tier and reassembles in input order"""
+        tiers = {"easy": "lfm2", "medium": "minicpm", "hard": "qwen3"}
+        router_instance = Mock()
+        router_instance.calculate_confidence = Mock(side_effect=lambda prompt: {
+            "confidence_score": 0.5,
+            "target_model": tiers[prompt.split("-")[0]]
+        })
+
+        def tier_model(label):
+            async def ainvoke(prompt, config=None):
+                return f"{label}:{prompt}"
+            model = Mock()
+            model.ainvoke = ainvoke
+            model.invoke_batch = Mock(
+                side_effect=lambda prompts, config=None: [f"{label}:{p}" for p in prompts]
+            )
+            return model
+
+        with patch('sarai_agi.cascade.get_confidence_router', return_value=router_instance):
+            cascade = CascadeWrapper()
+            with patch.object(cascade, '_get_lfm2', return_value=tier_model("t1")), \
+                 patch.object(cascade, '_get_minicpm', return_value=tier_model("t2")), \
+                 patch.object(cascade, '_invoke_qwen3', side_effect=lambda p, c=None: f"t3:{p}"):
+                responses = cascade.batch(["hard-1", "easy-1", "medium-1", "easy-2"])
+
+        assert responses == ["t3:hard-1", "t1:easy-1", "t2:medium-1", "t1:easy-2"]
+        assert router_instance.calculate_confidence.call_count == 4
+
+    def test_router_decision_cached_per_normalized_prompt(self):
+        """Test repeated prompts (modulo case/whitespace) skip the router"""
+        router_instance = Mock()
+        router_instance.calculate_confidence = Mock(return_value={
+            "confidence_score": 0.7,
+            "target_model": "lfm2"
+        })
+
+        with patch('sarai_agi.cascade.get_confidence_router', return_value=router_instance):
+            cascade = CascadeWrapper()
+            with patch.object(cascade, '_get_lfm2') as mock_lfm2_getter:
+                mock_lfm2_getter.return_value.invoke = Mock(return_value="Tier 1 response")
+
+                no_cache = {"no_cache": True}
+                cascade.invoke("What is Python?", no_cache)
+                cascade.invoke("  what is python?", no_cache)
+                cascade.invoke("What is Rust?", no_cache)
+
+        assert router_instance.calculate_confidence.call_count == 2
+        assert cascade._route_cache_hits == 1
+
+    def test_tier3_session_retries_transient_gateway_errors(self):
+        """Test the tier-3 adapter retries 502/503/504 but not connect errors"""
+        cascade = CascadeWrapper()
+        retry = cascade._get_ollama_session().get_adapter("http://localhost").max_retries
+
+        assert retry.status == 2
+        assert retry.connect == 0
+        assert set(retry.status_forcelist) == {502, 503, 504}
+        assert "POST" in retry.allowed_methods
+        assert retry.raise_on_status is False
+
+    def test_tier3_connection_error_falls_back_to_minicpm(self):
+        """Test an unreachable Qwen-3 server falls back to MiniCPM"""
+        import requests
+
+        router_instance = Mock()
+        router_instance.calculate_confidence = Mock(return_value={
+            "confidence_score": 0.1,
+            "target_model": "qwen3"
+        })
+
+        with patch('sarai_agi.cascade.get_confidence_router', return_value=router_instance), \
+             patch('requests.Session.post', side_effect=requests.ConnectionError("refused")):
+            cascade = CascadeWrapper()
+            with patch.object(cascade, '_get_minicpm') as mock_minicpm_getter:
+                mock_minicpm_getter.return_value.invoke = Mock(return_value="Tier 2 response")
+                response = cascade.invoke("Hard query")
+
+        assert response == "Tier 2 response"
+
+    def test_stream_tier3_yields_chunks(self):
+        """Test tier-3 streaming yields Ollama chunks as they arrive"""
+        router_instance = Mock()
+        router_instance.calculate_confidence = Mock(return_value={
+            "confidence_score": 0.1,
+            "target_model": "qwen3"
+        })
+
+        with patch('sarai_agi.cascade.get_confidence_router', return_value=router_instance), \
+             patch('requests.Session.post') as mock_post:
+            mock_post.return_value.status_code = 200
+            mock_post.return_value.iter_lines = Mock(return_value=iter([
+                b'{"response": "Deep ", "done": false}',
+                b'{"response": "answer", "done": false}',
+                b'{"response": "", "done": true}',
+            ]))
+
+            cascade = CascadeWrapper()
+            chunks = list(cascade.stream("Hard query"))
+
+        assert chunks == ["Deep ", "answer"]
+        assert mock_post.call_args.kwargs["stream"] is True
+        assert json.loads(mock_post.call_args.kwargs["data"])["stream"] is True
+        mock_post.return_value.close.assert_called_once()
+
+    def test_qwen3_endpoint_resolved_at_init(self, monkeypatch):
+        """Test tier-3 env vars are read once, at construction"""
+        monkeypatch.setenv("OLLAMA_BASE_URL", "http://ollama.test:11434")
+        monkeypatch.setenv("QWEN3_MODEL_NAME", "qwen3:test")
+        cascade = CascadeWrapper()
+        monkeypatch.setenv("QWEN3_MODEL_NAME", "changed")
+
+        assert cascade._qwen3_endpoint == "http://ollama.test:11434/api/generate"
+        assert cascade._get_qwen3() == {"url": "http://ollama.test:11434", "model": "qwen3:test"}
+        assert json.loads(cascade._qwen3_body("q", None, stream=False))["model"] == "qwen3:test"
+
+    def test_eager_tier1_warms_lfm2_in_background(self):
+        """Test warm_up (and eager_tier1) load router + LFM2 off the calling thread"""
+        mock_lfm2 = Mock()
+        warmed = threading.Event()
+        mock_lfm2._ensure_loaded = Mock(side_effect=lambda: warmed.set())
+
+        with patch('sarai_agi.cascade.get_confidence_router') as mock_router, \
+             patch.object(CascadeWrapper, '_get_lfm2', return_value=mock_lfm2):
+            CascadeWrapper().warm_up().join(timeout=2)
+            assert warmed.is_set()
+            warmed.clear()
+            CascadeWrapper(eager_tier1=True)
+            assert warmed.wait(timeout=2)
+
+        assert mock_router.call_count == 2
+
+    def test_qwen3_body_matches_json_payload(self):
+        """Test the prebuilt tier-3 body serializes the same request as json="""
+        cascade = CascadeWrapper()
+        prompt = 'Explain "quotes", ñ and \\ escapes\nplease'
+
+        body = json.loads(cascade._qwen3_body(prompt, None, stream=False))
+        custom = json.loads(
+            cascade._qwen3_body(prompt, {"temperature": 0.2, "max_tokens": 64}, stream=True)
+        )
+
+        assert body == {
+            "model": cascade._qwen3_model,
+            "stream": False,
+            "options": {"temperature": 0.7, "num_predict": 512},
+            "prompt": prompt,
+        }
+        assert custom["options"] == {"temperature": 0.2, "num_predict": 64}
+        assert custom["stream"] is True
+        assert custom["prompt"] == prompt
+
+    def test_get_cascade_wrapper_is_singleton(self, fresh_cascade):
+        """Test every caller shares one CascadeWrapper, created without warm-up"""
+        assert get_cascade_wrapper() is get_cascade_wrapper()
+        assert get_model("solar") is get_model("expert")
+        fresh_cascade.assert_not_called()
+
+    def test_response_cache_skips_cascade_for_repeated_prompt(self):
+        """Test repeated prompts are answered from the (opt-in) response cache"""
+        router_instance = Mock()
+        router_instance.calculate_confidence = Mock(return_value={
+            "confidence_score": 0.7,
+            "target_model": "lfm2"
+        })
+
+        with patch('sarai_agi.cascade.get_confidence_router', return_value=router_instance):
+            cascade = CascadeWrapper()
+            with patch.object(cascade, '_get_lfm2') as mock_lfm2_getter, \
+                 patch.object(cascade, 'RESPONSE_CACHE_TTL', 3600.0):
+                tier1 = mock_lfm2_getter.return_value
+                tier1.invoke = Mock(side_effect=["first", "second", "third", "fourth"])
+
+                assert cascade.invoke("What is Python?") == "first"
+                assert cascade.invoke("  What is Python?\n") == "first"
+                # Only surrounding whitespace is normalized: case is significant
+                assert cascade.invoke("what is python?") == "second"
+                assert cascade.invoke("What is Python?", {"no_cache": True}) == "third"
+
+                # Expired entries are regenerated
+                with patch.object(cascade, 'RESPONSE_CACHE_TTL', 0.001):
+                    time.sleep(0.01)
+                    assert cascade.invoke("What is Python?") == "fourth"
+
+        assert tier1.invoke.call_count == 4
+
+    def test_response_cache_is_off_by_default(self):
+        """Test sampled responses are not replayed unless the cache is enabled"""
+        router_instance = Mock()
+        router_instance.calculate_confidence = Mock(return_value={
+            "confidence_score": 0.7,
+            "target_model": "lfm2"
+        })
+
+        with patch('sarai_agi.cascade.get_confidence_router', return_value=router_instance):
+            cascade = CascadeWrapper()
+            with patch.object(cascade, '_get_lfm2') as mock_lfm2_getter:
+                tier1 = mock_lfm2_getter.return_value
+                tier1.invoke = Mock(side_effect=["first", "second"])
+
+                assert cascade.invoke("What is Python?") == "first"
+                assert cascade.invoke("What is Python?") == "second"
+
+        assert not cascade._response_cache
+
+    @pytest.mark.asyncio
+    async def test_abatch_uses_response_cache(self):
+        """Test abatch serves cached prompts and only dispatches the misses"""
+        router_instance = Mock()
+        router_instance.calculate_confidence = Mock(return_value={
+            "confidence_score": 0.5,
+            "target_model": "minicpm"
+        })
+        dispatched = []
+
+        async def minicpm_ainvoke(prompt, config=None):
+            dispatched.append(prompt)
+            return f"t2:{prompt}"
+
+        with patch('sarai_agi.cascade.get_confidence_router', return_value=router_instance):
+            cascade = CascadeWrapper()
+            with patch.object(cascade, '_get_minicpm', return_value=Mock(ainvoke=minicpm_ainvoke)), \
+                 patch.object(cascade, 'RESPONSE_CACHE_TTL', 3600.0):
+                assert await cascade.ainvoke("a") == "t2:a"
+                assert await cascade.abatch(["a", "b"]) == ["t2:a", "t2:b"]
+                assert await cascade.abatch(["b", "a"]) == ["t2:b", "t2:a"]
+
+        assert dispatched == ["a", "b"]
+
+    def test_tier_selection_by_confidence(self, fresh_cascade):
         """Test tier selection based on confidence score"""
         with patch('sarai_agi.cascade.get_confidence_router') as mock_router:
             router_instance = Mock()